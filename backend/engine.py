@@ -7,44 +7,133 @@ Zamanlama hassasiyeti korunur (busy-wait, Date header geçişi vb.).
 import time
 import threading
 import queue
+import json
+import http.client
 import subprocess
 import sys
 import ctypes
 import os
 import socket
+import ssl
+import struct
 import gc
+import heapq
+import re
+import random
 from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import pairwise
+from functools import lru_cache
+from operator import itemgetter
+from datetime import datetime
 from email.utils import parsedate_to_datetime
 from dataclasses import dataclass, field
-from typing import Optional, Callable
+from typing import Optional, Callable, NamedTuple
 
 import requests
 import requests.adapters
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
+from urllib3.util.wait import wait_for_read
+
+try:
+    import orjson
+    _json_loads = orjson.loads  # retry döngüsünde yanıt parse'ı (stdlib json'dan 2-5x hızlı)
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    from backports.zoneinfo import ZoneInfo  # Python <3.9 fallback
+
+# Busy-wait sırasında CPU'yu bırakmak için (Windows'ta yok)
+_sched_yield = getattr(os, "sched_yield", None)
+
+# Kayıt saati her zaman Türkiye saatiyle yorumlanır (TZDB bir kez yüklenir)
+_TZ_IST = ZoneInfo("Europe/Istanbul")
+
+
+@lru_cache(maxsize=8)
+def _saat_epoch_cached(saat_str: str, gun_ordinal: int) -> float:
+    """(saat, gün) → epoch. Gün anahtarı sayesinde gece yarısı geçişinde cache kendiliğinden yenilenir."""
+    h, m, s = map(int, saat_str.split(":"))
+    gun = datetime.fromordinal(gun_ordinal)
+    target = datetime(gun.year, gun.month, gun.day, h, m, s, tzinfo=_TZ_IST)
+    return target.timestamp()
+
+
+# ── TCP soket seçenekleri (session havuzu ve pinned tetik bağlantıları ortak) ──
+#   - TCP_NODELAY: Nagle algoritmasını devre dışı bırak (küçük paketler hemen gönderilir)
+#   - SO_KEEPALIVE: OS seviyesinde TCP keepalive (bağlantı timeout'unu önler)
+#   - TCP_QUICKACK (Linux): Gecikmeli ACK'ları devre dışı bırak → RTT 5-15ms düşer
+#   - TCP_SLOW_START_AFTER_IDLE=0 (Linux): Boşta kaldıktan sonra cwnd reset'ini önler
+#   - SO_PRIORITY=6 (Linux): qdisc'te bu soketin paketleri öne alınır (root gerekmez, 0-6)
+TCP_QUICKACK = 12
+_QUICKACK_REARM = sys.platform == "linux"
+TCP_SOCKET_OPTIONS: list[tuple[int, int, int]] = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if sys.platform == "linux":
+    TCP_SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, TCP_QUICKACK, 1),
+        (socket.IPPROTO_TCP, 23, 0),  # TCP_SLOW_START_AFTER_IDLE=0
+        (socket.SOL_SOCKET, getattr(socket, "SO_PRIORITY", 12), 6),
+    ]
+
+
+def apply_socket_options(sock: socket.socket):
+    """TCP_SOCKET_OPTIONS'ı açık bir sokete uygula (desteklenmeyen seçenek sessizce atlanır)."""
+    for level, opt, val in TCP_SOCKET_OPTIONS:
+        try:
+            sock.setsockopt(level, opt, val)
+        except OSError:
+            pass
 
 
 class OptimizedHTTPAdapter(requests.adapters.HTTPAdapter):
-    """Socket seviyesinde TCP optimizasyonları uygulayan HTTP adapter.
-
-    - TCP_NODELAY: Nagle algoritmasını devre dışı bırak (küçük paketler hemen gönderilir)
-    - SO_KEEPALIVE: OS seviyesinde TCP keepalive (bağlantı timeout'unu önler)
-    - TCP_QUICKACK (Linux): Gecikmeli ACK'ları devre dışı bırak → RTT 5-15ms düşer
-    - TCP_SLOW_START_AFTER_IDLE=0 (Linux): Boşta kaldıktan sonra cwnd reset'ini önler
-    """
+    """Socket seviyesinde TCP optimizasyonları (TCP_SOCKET_OPTIONS) uygulayan HTTP adapter."""
 
     def init_poolmanager(self, *args, **kwargs):
         super().init_poolmanager(*args, **kwargs)
         if hasattr(self.poolmanager, 'connection_pool_kw'):
             opts = list(self.poolmanager.connection_pool_kw.get('socket_options', []))
-            opts.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
-            opts.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
-            if sys.platform == "linux":
-                opts.append((socket.IPPROTO_TCP, 12, 1))  # TCP_QUICKACK
-                opts.append((socket.IPPROTO_TCP, 23, 0))  # TCP_SLOW_START_AFTER_IDLE=0
+            opts.extend(TCP_SOCKET_OPTIONS)
             self.poolmanager.connection_pool_kw['socket_options'] = opts
 
 
+def _new_http_session(token: str, adapter: requests.adapters.HTTPAdapter) -> requests.Session:
+    """Token header'lı requests.Session; bağlantı havuzu verilen adapter'dan gelir."""
+    s = requests.Session()
+    s.headers.update({
+        "Authorization": f"Bearer {token}",
+        "User-Agent": USER_AGENT,
+    })
+    s.mount("https://", adapter)
+    return s
+
+
+# test_token/calibrate uç noktaları için paylaşılan bağlantı havuzu —
+# çağrılar arası TCP+TLS bağlantısı yeniden kullanılır (header/cookie'ler session başına kalır)
+_light_adapter: Optional["OptimizedHTTPAdapter"] = None
+_light_adapter_lock = threading.Lock()
+
+
+def _shared_adapter() -> "OptimizedHTTPAdapter":
+    global _light_adapter
+    if _light_adapter is None:
+        with _light_adapter_lock:
+            if _light_adapter is None:
+                _light_adapter = OptimizedHTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=0)
+    return _light_adapter
+
+
 OBS_URL = "https://obs.itu.edu.tr/api/ders-kayit/v21"
 OBS_BASE = "https://obs.itu.edu.tr"
+OBS_HOST = "obs.itu.edu.tr"
+OBS_PATH = "/api/ders-kayit/v21"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
 HATA_KODLARI = {
     "VAL02": "Kayıt dönemi henüz açılmadı",
@@ -55,6 +144,283 @@ HATA_KODLARI = {
     "VAL22": "Yükseltmeye alınan ders çakışması",
 }
 
+_POST_LINE = f"POST {OBS_PATH} HTTP/1.1\r\n".encode()
+
+# ecrnResultList öğesi alanları (tek C çağrısıyla çekilir)
+_RESULT_KEYS = ("crn", "statusCode", "resultCode", "resultData")
+_RESULT_FIELDS = itemgetter(*_RESULT_KEYS)
+
+# Tüm-VAL02 yanıt ön kontrolü (JSON parse etmeden)
+_STATUS_OK_RE = re.compile(rb'"statusCode"\s*:\s*0\b')
+
+
+def _all_val02(content: bytes, n_crn: int) -> bool:
+    """Yanıttaki her resultCode VAL02 ve hiçbir öğe statusCode 0 değil mi? (ham bytes üzerinde)"""
+    return (
+        content.count(b'"VAL02"') == n_crn
+        and content.count(b'"resultCode"') == n_crn
+        and _STATUS_OK_RE.search(content) is None
+    )
+
+
+# Tekrar denenecek (sistem açılmadı / debounce) sonuç kodları
+RETRYABLE_CODES = frozenset({"VAL02", "VAL16"})
+
+# /status yanıtını değiştiren event tipleri (log/countdown hariç) → state_version artar
+_STATE_EVENTS = frozenset({"state", "crn_update", "calibration", "done"})
+
+# VAL02/VAL16 dışı hızlı retry'lar için artan bekleme (ms), ardışık hızlı retry sayısıyla indekslenir.
+# Tümü VAL02/VAL16 ise retry_aralik korunur — sunucu <3sn'de tekrarı debounce eder.
+RETRY_SCHEDULE_MS = (30, 60, 120, 250, 500)
+
+# 429: Retry-After yoksa üstel geri çekilme (sn) + jitter — urllib3 Retry varsayılanlarıyla aynı mantık
+RATE_BACKOFF_BASE = 1.0
+RATE_BACKOFF_MAX = 30.0
+RATE_BACKOFF_JITTER = 0.5
+_RETRY_AFTER = Retry(total=None, respect_retry_after_header=True)
+
+
+def rate_limit_wait(retry_after: str | None, ardisik: int) -> float:
+    """429 sonrası bekleme süresi (sn). Retry-After (saniye veya HTTP-date) her zaman önceliklidir.
+
+    POST'lar adapter seviyesinde otomatik tekrarlanmaz (VAL16 debounce riski);
+    tetik yolu ham bağlantı kullandığı için politika burada uygulanır.
+    """
+    if retry_after:
+        try:
+            return _RETRY_AFTER.parse_retry_after(retry_after) + random.uniform(0, RATE_BACKOFF_JITTER)
+        except InvalidHeader:
+            pass
+    backoff = min(RATE_BACKOFF_MAX, RATE_BACKOFF_BASE * (2 ** ardisik))
+    return backoff + random.uniform(0, RATE_BACKOFF_JITTER)
+
+
+def _precise_sleep(sec: float):
+    """Kısa bekleme: son 10ms perf_counter_ns ile spin (Windows'ta sleep ~15ms taşabilir)."""
+    if sec <= 0:
+        return
+    deadline_ns = time.perf_counter_ns() + int(sec * 1e9)
+    if sec > 0.020:
+        time.sleep(sec - 0.010)
+    while time.perf_counter_ns() < deadline_ns:
+        pass
+
+
+# ioprio_set syscall numarası (mimariye göre; glibc wrapper'ı yok)
+_IOPRIO_SYSCALL = {"x86_64": 251, "aarch64": 30, "i386": 289, "i686": 289}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_RT = 1
+IOPRIO_CLASS_SHIFT = 13
+
+
+def _set_ioprio_rt(level: int = 4) -> bool:
+    """Linux: process IO önceliğini RT sınıfına al (CAP_SYS_ADMIN gerekir; yoksa sessizce False)."""
+    if sys.platform != "linux":
+        return False
+    nr = _IOPRIO_SYSCALL.get(os.uname().machine)
+    if nr is None:
+        return False
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        ret = libc.syscall(nr, IOPRIO_WHO_PROCESS, 0, (IOPRIO_CLASS_RT << IOPRIO_CLASS_SHIFT) | level)
+    except (OSError, AttributeError):
+        return False
+    return ret == 0
+
+
+NTP_EPOCH_DELTA = 2208988800  # 1900 → 1970 (sn)
+_NS = 1_000_000_000
+
+
+def _ntp_now() -> int:
+    """Yerel saat → 64-bit NTP sabit noktalı zaman damgası (saniye << 32 | kesir)."""
+    return ((time.time_ns() + NTP_EPOCH_DELTA * _NS) << 32) // _NS
+
+
+def sntp_query(server: str, timeout: float = 3.0) -> tuple[int, int]:
+    """Tek SNTP sorgusu → (offset_ns, delay_ns).
+
+    T1..T4 64-bit NTP tamsayıları olarak tutulur, offset/delay tamsayı ns'de
+    hesaplanır — 1e9 ölçekli float çıkarmalarındaki µs kaybı olmaz.
+    offset = sunucu_saati - yerel_saat (pozitif: sunucu ileride).
+    """
+    family, _, _, _, sockaddr = socket.getaddrinfo(server, 123, 0, socket.SOCK_DGRAM)[0]
+    with socket.socket(family, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        t1 = _ntp_now()
+        # LI=0, VN=3, Mode=3 (client); transmit timestamp = T1 (sunucu originate'e kopyalar)
+        sock.sendto(b"\x1b" + bytes(39) + t1.to_bytes(8, "big"), sockaddr)
+        data, _ = sock.recvfrom(256)
+        t4 = _ntp_now()
+
+    if len(data) < 48:
+        raise ValueError(f"Kısa NTP yanıtı ({len(data)} byte)")
+    if data[1] == 0:
+        raise ValueError("NTP kiss-of-death (stratum 0)")
+    t0_echo, t2, t3 = struct.unpack_from("!QQQ", data, 24)
+    if t0_echo != t1:
+        raise ValueError("NTP yanıtı bu isteğe ait değil")
+
+    offset_ns = (((t2 - t1) + (t3 - t4)) * _NS) >> 33
+    delay_ns = (((t4 - t1) - (t3 - t2)) * _NS) >> 32
+    return offset_ns, delay_ns
+
+
+# Tetik bağlantıları için ortak TLS bağlamı — oturum (ticket) yeniden kullanımı aynı context'i gerektirir
+_TLS_CTX = ssl.create_default_context()
+
+
+class _ResumableHTTPSConnection(http.client.HTTPSConnection):
+    """Önceki TLS oturumunu vererek bağlanan HTTPSConnection (yeniden bağlanmada tam el sıkışma atlanır)."""
+
+    def __init__(self, host: str, tls_session: Optional[ssl.SSLSession] = None, **kwargs):
+        super().__init__(host, context=_TLS_CTX, **kwargs)
+        self._tls_session = tls_session
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)  # TCP
+        self.sock = self._context.wrap_socket(self.sock, server_hostname=self.host, session=self._tls_session)
+
+
+class PinnedConnection:
+    """Kayıt POST'u için kalıcı HTTPS bağlantısı (requests/urllib3 katmanını atlar).
+
+    İstekler önceden hazırlanmış bytes olarak doğrudan sokete yazılır.
+    POST otomatik tekrarlanmaz (sunucuya ulaşmışsa VAL16 debounce riski);
+    hata durumunda bağlantı kapatılır, bir sonraki çağrı yenisini açar.
+    """
+
+    def __init__(self):
+        self._conn: Optional[http.client.HTTPSConnection] = None
+        self._tls_session: Optional[ssl.SSLSession] = None  # son başarılı istekten kalan oturum
+        self.resumed = False  # son açılışta TLS oturumu yeniden kullanıldı mı
+        # Açılıştan beri hiç istek tamamlanmadı: TLS 1.3 NewSessionTicket el sıkışmadan hemen
+        # sonra gelir → yeni soket hep okunabilir görünür, kopma kontrolü yanlış alarm verir
+        self._fresh = False
+        # _conn değişimleri kilitli; her open/close nesli artırır. Takılı kalmış bir keepalive
+        # işçisi uyandığında yalnızca kendi kullandığı bağlantıya dokunabilir (bkz. open(expect_generation))
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def open(self, expect_generation: Optional[int] = None) -> Optional[http.client.HTTPSConnection]:
+        """Bağlantıyı aç. Eski bağlantı varsa kapatılır; önceki TLS oturumu varsa devam ettirilir.
+
+        expect_generation verilirse ve bu arada başka thread bağlantıyı kapatıp/yenilediyse
+        yeni bağlantı kurulmaz (kurulduysa atılır) → None döner. El sıkışma kilit dışında yapılır."""
+        if expect_generation is not None and self.generation != expect_generation:
+            return None
+        conn = _ResumableHTTPSConnection(OBS_HOST, tls_session=self._tls_session, timeout=10)
+        conn.connect()
+        apply_socket_options(conn.sock)
+        with self._lock:
+            if expect_generation is not None and self.generation != expect_generation:
+                old = conn  # geç kaldık — tetik/retry bağlantıyı zaten sahiplendi
+            else:
+                old, self._conn = self._conn, conn
+                self.generation += 1
+                self.resumed = getattr(conn.sock, "session_reused", False)
+                self._fresh = True
+        if old is not None:
+            old.close()
+        return None if old is conn else conn
+
+    def close(self):
+        with self._lock:
+            old, self._conn = self._conn, None
+            self.generation += 1
+        if old is not None:
+            old.close()
+
+    def _discard(self, conn: http.client.HTTPSConnection):
+        """Kullanılan bağlantıyı kapat; yalnızca hâlâ güncel bağlantıysa yerinden kaldır."""
+        with self._lock:
+            if self._conn is conn:
+                self._conn = None
+        conn.close()
+
+    def send(self, request_bytes: bytes, method: str = "POST") -> tuple[int, http.client.HTTPMessage, bytes]:
+        """Hazır HTTP isteğini sokete yaz → (status, headers, body)."""
+        # Boştaki soket okunabilir → sunucu kapatmış (urllib3 is_connection_dropped mantığı).
+        # Taze bağlantıda atlanır: okunmamış veri henüz ticket kaydı, EOF değil.
+        conn = self._conn
+        if conn is None or conn.sock is None or (not self._fresh and wait_for_read(conn.sock, timeout=0.0)):
+            conn = self.open()
+        sock = conn.sock
+        try:
+            if _QUICKACK_REARM:
+                # QUICKACK kalıcı değil — kernel sıfırlayabilir, her istekten önce yeniden kur
+                sock.setsockopt(socket.IPPROTO_TCP, TCP_QUICKACK, 1)
+            sock.sendall(request_bytes)
+            resp = http.client.HTTPResponse(sock, method=method)
+            resp.begin()
+            data = resp.read()
+        except (http.client.HTTPException, OSError):
+            self._discard(conn)
+            raise
+        if self._conn is conn:
+            self._fresh = False  # ticket kayıtları yanıtla birlikte okundu
+        # TLS 1.3 ticket'ı el sıkışmadan sonra gelir → ilk yanıt okunduktan sonra sakla
+        self._tls_session = getattr(sock, "session", None) or self._tls_session
+        if resp.will_close:
+            self._discard(conn)
+        return resp.status, resp.headers, data
+
+
+class Event(NamedTuple):
+    """Engine event'i. Dict yerine tuple (daha hafif); WS'e gönderilirken _asdict() ile çevrilir."""
+    type: str
+    data: dict
+    timestamp: float
+
+
+@dataclass(frozen=True, slots=True)
+class CRNResultTable:
+    """CRN sonuçlarının değişmez sütun (SoA) görüntüsü — satır başına tuple yerine üç paralel tuple.
+    Sıra ecrn_list sırasıdır; iterasyon (crn, status, message) satırları üretir."""
+    crns: tuple[str, ...] = ()
+    statuses: tuple[str, ...] = ()
+    messages: tuple[str, ...] = ()
+
+    @classmethod
+    def from_results(cls, results: dict[str, dict]) -> "CRNResultTable":
+        if not results:
+            return _EMPTY_RESULTS
+        infos = results.values()
+        return cls(
+            tuple(results),
+            tuple(info["status"] for info in infos),
+            tuple(info["message"] for info in infos),
+        )
+
+    def __iter__(self):
+        return zip(self.crns, self.statuses, self.messages)
+
+    def __len__(self) -> int:
+        return len(self.crns)
+
+
+_EMPTY_RESULTS = CRNResultTable()
+
+
+@dataclass(frozen=True, slots=True)
+class WaitWindows:
+    """Bekleme döngüsü pencereleri (sn, kalan süreye göre). Döngüden önce yerel değişkenlere açılır."""
+    recal_interval: float = 30  # her X saniyede hafif kalibrasyon
+    recal_min: float = 25  # bundan yakınsa periyodik kalibrasyon yok
+    final_cal: tuple[float, float] = (10, 20)  # son tam kalibrasyon (min, max)
+    prewarm: float = 10  # HEAD ile ikinci ısıtma
+    keepalive1: tuple[float, float] = (4.5, 5.5)
+    keepalive2: tuple[float, float] = (3.0, 4.0)
+    probe: tuple[float, float] = (1.5, 2.5)
+    rtt_watch_min: float = 5  # RTT izleme bu süreden uzakta yapılır
+    drain: float = 1.0  # arka plan keepalive bu süreden sonra kapatılır
+    countdown_fine: float = 2.0  # bundan sonra her turda countdown
+    tick: float = 1.0  # en uzun tek uyku (countdown/periyodik kalibrasyon kontrolü)
+    busy_wait: float = 0.05
+
+
+WAIT = WaitWindows()
+
 
 @dataclass
 class CalibrationData:
@@ -70,13 +436,21 @@ class TrendAnalyzer:
     def __init__(self, window_size=10):
         self.window_size = window_size
         self.data_points = deque(maxlen=window_size)  # [(timestamp, value), ...]
+        self._cached: tuple[float, float] | None = None  # (slope, intercept) — yeni ölçümde geçersiz
     
     def add_measurement(self, timestamp, value):
         """Yeni ölçüm ekle"""
         self.data_points.append((timestamp, value))
+        self._cached = None
     
     def calculate_linear_trend(self):
-        """Lineer regresyonla trend hesapla: y = mx + b"""
+        """Lineer regresyonla trend hesapla: y = mx + b (ölçüm gelene kadar cache'li)"""
+        if self._cached is not None:
+            return self._cached
+        self._cached = self._fit()
+        return self._cached
+
+    def _fit(self):
         if len(self.data_points) < 2:
             return 0.0, 0.0  # slope, intercept
         
@@ -111,31 +485,26 @@ class ChangeDetector:
         self.threshold = threshold  # 50ms değişiklik eşik değeri
         self.min_window = min_window
         self.values = deque(maxlen=10)
+        self._prev: float | None = None  # sondan bir önceki değer
+        self._last: float | None = None
     
     def add_value(self, value):
         """Yeni değeri ekle"""
         self.values.append(value)
+        self._prev, self._last = self._last, value
     
     def detect_significant_change(self):
-        """Anlamlı değişiklik olup olmadığını kontrol et"""
-        if len(self.values) < self.min_window:
+        """Anlamlı değişiklik olup olmadığını kontrol et (son iki değer arasındaki fark)"""
+        if len(self.values) < self.min_window or self._prev is None:
             return False
-        
-        # Son iki değre arasındaki fark
-        if len(self.values) >= 2:
-            recent_change = abs(self.values[-1] - self.values[-2])
-            return recent_change > self.threshold
-        
-        return False
+        return abs(self._last - self._prev) > self.threshold
     
     def calculate_average_change(self):
         """Ortalama değişim miktarını hesapla"""
-        if len(self.values) < 2:
+        n = len(self.values)
+        if n < 2:
             return 0.0
-        
-        changes = [abs(self.values[i+1] - self.values[i]) 
-                   for i in range(len(self.values)-1)]
-        return sum(changes) / len(changes) if changes else 0.0
+        return sum(abs(b - a) for a, b in pairwise(self.values)) / (n - 1)
 
 
 class RegistrationEngine:
@@ -150,6 +519,8 @@ class RegistrationEngine:
         max_deneme: int = 60,
         retry_aralik: float = 3.0,
         dry_run: bool = False,
+        paralel_baglanti: int = 1,
+        http_adapter: Optional[requests.adapters.HTTPAdapter] = None,
     ):
         self.token = token
         self.ecrn_list = list(ecrn_list)
@@ -161,17 +532,27 @@ class RegistrationEngine:
         self.dry_run = dry_run
 
         self._events: queue.Queue = queue.Queue()
+        # Event geldiğinde tüketiciyi uyandıran zil (ör. asyncio loop'a call_soon_threadsafe).
+        # Bekleyen bir zil varsa tekrar çalınmaz → sıcak yolda event başına syscall yok.
+        self._notify: Optional[Callable[[], None]] = None
+        self._notify_pending = False
         self._cancelled = threading.Event()
         self._running = False
         self._phase = "idle"
         self._current_attempt = 0
         self._calibration: Optional[CalibrationData] = None
-        self._cal_samples: list[tuple[float, float, float, str]] = []  # (offset, rtt, timestamp, source)
+        # En iyi 20 ölçüm havuzu: RTT'ye göre max-heap → (-rtt, (offset, rtt, timestamp, source))
+        self._cal_samples: list[tuple[float, tuple[float, float, float, str]]] = []
+        self._best_sample: Optional[tuple[float, float, float, str]] = None  # En düşük RTT'li ölçüm
         self._crn_results: dict[str, dict] = {}
+        self._results_dirty = False  # son crn_update'ten beri değişiklik var mı
+        # /status için değişmez sonuç tablosu — yayınlanan sonuçlarla aynı an
+        self._crn_snapshot: CRNResultTable = _EMPTY_RESULTS
         self._trigger_time: Optional[float] = None
+        self._state_version = 0  # /status ETag'i için — durum değiştiren her event'te artar
 
         # Ölçüm tabanlı zamanlama
-        self._last_ntp_delay: Optional[float] = None  # Son NTP delay (sn)
+        self._last_ntp_delay_ns: Optional[int] = None  # Son NTP delay (ns)
         # Cloud Run kalibrasyon sonuçları (2026-02-15, 5000 ölçüm, europe-west1)
         # OBS saati NTP'ye göre +1.5ms ileri, σ=4.08ms (95% CI: ±8.0ms)
         self._obs_clock_offset: float = 0.0015   # OBS-NTP saat farkı (sn) [+ileri]
@@ -182,32 +563,80 @@ class RegistrationEngine:
         self._change_detector = ChangeDetector(threshold=0.050)  # 50ms eşik
         self._target_time: Optional[float] = None  # Hedef zamanı sakla
         self._last_val02_delay: float = 0.0  # VAL02 log spam önleyici
-        self._cal_samples_chrono: list[tuple[float, float, float, str]] = []  # Kronolojik sıralı kopya
+        self._cal_samples_chrono: deque[tuple[float, float, float, str]] = deque(maxlen=20)  # Kronolojik sıralı kopya
 
-        # Session
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Authorization": f"Bearer {token}",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        })
-        adapter = OptimizedHTTPAdapter(
+        # Session (http_adapter verilirse bağlantı havuzu paylaşılır)
+        adapter = http_adapter or OptimizedHTTPAdapter(
             pool_connections=1, pool_maxsize=5, max_retries=0,
         )
-        self.session.mount("https://", adapter)
+        self.session = _new_http_session(token, adapter)
+
+        # Tetik POST'u için kalıcı ham bağlantılar (requests/urllib3 katmanını atlar)
+        # CRN'ler sabit shard'lara dağıtılır: crn → bağlantı indeksi (retry'larda değişmez)
+        self.paralel_baglanti = max(1, paralel_baglanti)
+        self._conns = [PinnedConnection() for _ in range(self.paralel_baglanti)]
+        self._shard_of = {crn: i % self.paralel_baglanti for i, crn in enumerate(self.ecrn_list)}
+        self._send_pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=self.paralel_baglanti) if self.paralel_baglanti > 1 else None
+        )
+        # Keepalive HEAD'leri sayım thread'ini bloklamasın diye tek işçili arka plan havuzu
+        # (tek işçi: aynı pinned bağlantılara sıralı erişim)
+        self._keepalive_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="keepalive")
+        self._keepalive_future = None
+        self._keepalive_stop = threading.Event()
+        # Periyodik hafif kalibrasyon da arka planda — sayım sürerken ölçüm yapılır
+        self._cal_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="calibration")
+        # Oturum boyunca sabit header bloğu — bir kez encode edilir
+        self._header_bytes = (
+            f"Host: {OBS_HOST}\r\n"
+            f"Authorization: Bearer {token}\r\n"
+            f"User-Agent: {USER_AGENT}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Connection: keep-alive\r\n"
+        ).encode("latin-1")
+        self._head_request = f"HEAD {OBS_PATH} HTTP/1.1\r\n".encode() + self._header_bytes + b"\r\n"
+        # Gövde parçaları: CRN başına JSON string + sabit SCRN kuyruğu (json.dumps tetik yolundan çıkar)
+        self._crn_json = {crn: json.dumps(crn).encode() for crn in self.ecrn_list}
+        self._body_tail = b'],"SCRN":' + json.dumps(self.scrn_list, separators=(",", ":")).encode() + b"}"
+        # Tam CRN kümesi için ilk istek(ler) önceden hazır
+        self._initial_batches = self._build_batches(self.ecrn_list)
 
     # ── Event emitter ──
 
     def _emit(self, event_type: str, data: dict | None = None):
-        self._events.put({
-            "type": event_type,
-            "data": data or {},
-            "timestamp": time.time(),
-        })
+        if event_type in _STATE_EVENTS:
+            if event_type == "crn_update" or event_type == "done":
+                self._snapshot_results()  # sürümü de artırır
+            else:
+                self._state_version += 1
+        self._events.put(Event(event_type, data or {}, time.time()))
+        if self._notify is not None and not self._notify_pending:
+            self._notify_pending = True
+            self._notify()
+
+    def _set_trigger_time(self, t: float):
+        """Tetik zamanını güncelle; değiştiyse /status ETag'i de değişsin (geri sayım buna bakar)."""
+        if t != self._trigger_time:
+            self._trigger_time = t
+            self._state_version += 1
+
+    def _snapshot_results(self):
+        # Değerler yerinde değişmez (_set_result yeni dict atar) → sütunlara kopyalamak yeterli.
+        # Önce anlık görüntü, sonra sürüm: /status yeni ETag'i eski sonuçlarla eşleyemez
+        self._crn_snapshot = CRNResultTable.from_results(self._crn_results)
+        self._state_version += 1
 
     def _log(self, msg: str, level: str = "info"):
         self._emit("log", {"message": msg, "level": level})
 
-    def get_events(self) -> list[dict]:
+    def set_notifier(self, notify: Optional[Callable[[], None]]):
+        """Yeni event geldiğinde çağrılacak fonksiyonu ayarla (engine thread'inden çağrılır)."""
+        self._notify_pending = False
+        self._notify = notify
+
+    def get_events(self) -> list[Event]:
+        # Boşaltmadan önce sıfırla: boşaltma sırasında gelen event yeni zil çalar
+        self._notify_pending = False
         events = []
         while not self._events.empty():
             try:
@@ -226,6 +655,10 @@ class RegistrationEngine:
     def phase(self) -> str:
         return self._phase
 
+    @property
+    def state_version(self) -> int:
+        return self._state_version
+
     @property
     def current_attempt(self) -> int:
         return self._current_attempt
@@ -238,6 +671,11 @@ class RegistrationEngine:
     def crn_results(self) -> dict:
         return self._crn_results
 
+    @property
+    def crn_results_snapshot(self) -> CRNResultTable:
+        """Engine thread'i değiştirirken de güvenle okunabilen sonuç tablosu (satırlar: crn, status, message)."""
+        return self._crn_snapshot
+
     @property
     def trigger_time(self) -> Optional[float]:
         return self._trigger_time
@@ -248,10 +686,9 @@ class RegistrationEngine:
 
     def _best_calibration(self) -> Optional[CalibrationData]:
         """Tüm ölçüm havuzundan en düşük RTT'li sample'ı seç (en güvenilir offset)."""
-        if not self._cal_samples:
+        best = self._best_sample  # En düşük RTT = en yüksek güvenilirlik
+        if best is None:
             return self._calibration
-        # En düşük RTT = en yüksek güvenilirlik
-        best = min(self._cal_samples, key=lambda s: s[1])
         return CalibrationData(
             server_offset=best[0],
             rtt_one_way=best[1] / 2,
@@ -290,8 +727,8 @@ class RegistrationEngine:
     def _add_sample(self, offset: float, rtt: float, source: str):
         """Kalibrasyon ölçüm havuzuna yeni sample ekle. Max 20 tutar, eski/kötü olanları atar."""
         # Outlier filtresi: mevcut en iyi offset'ten 200ms+ sapan ölçümleri reddet
-        if self._cal_samples:
-            best_offset = min(self._cal_samples, key=lambda s: s[1])[0]
+        if self._best_sample is not None:
+            best_offset = self._best_sample[0]
             deviation = abs(offset - best_offset)
             if deviation > 0.200:  # 200ms eşik
                 self._log(
@@ -301,15 +738,14 @@ class RegistrationEngine:
                 return  # Havuza ekleme
 
         sample = (offset, rtt, time.time(), source)
-        self._cal_samples.append(sample)
-        self._cal_samples_chrono.append(sample)  # Kronolojik kopya (sıralama bozulmaz)
-        # Havuzu 20 ile sınırla: en kötü RTT'lileri at
-        if len(self._cal_samples) > 20:
-            self._cal_samples.sort(key=lambda s: s[1])
-            self._cal_samples = self._cal_samples[:20]
-        # Kronolojik listeyi de 20 ile sınırla (eski olanları at)
-        if len(self._cal_samples_chrono) > 20:
-            self._cal_samples_chrono = self._cal_samples_chrono[-20:]
+        self._cal_samples_chrono.append(sample)  # Kronolojik kopya (deque son 20'yi tutar)
+        # Havuzu 20 ile sınırla: doluysa en kötü RTT'liyi at (yeni sample da olabilir)
+        if len(self._cal_samples) < 20:
+            heapq.heappush(self._cal_samples, (-rtt, sample))
+        else:
+            heapq.heappushpop(self._cal_samples, (-rtt, sample))
+        if self._best_sample is None or rtt < self._best_sample[1]:
+            self._best_sample = sample
 
     def _update_trend_analysis(self):
         """Trend analizini güncelle."""
@@ -401,7 +837,7 @@ class RegistrationEngine:
         GUVEN_SEVIYESI = 2.0  # N: 2=%97.7, 3=%99.9
 
         # σ_ntp: NTP ölçüm hassasiyeti (delay/2)
-        ntp_delay = self._last_ntp_delay or 0.008
+        ntp_delay = self._last_ntp_delay_ns / _NS if self._last_ntp_delay_ns else 0.008
         sigma_ntp = ntp_delay / 2  # tipik: ~4ms
 
         # σ_rtt: Ağ RTT değişkenliği (ölçülen jitter)
@@ -437,15 +873,14 @@ class RegistrationEngine:
 
     # ── NTP Kalibrasyon (birincil offset kaynağı) ──
 
-    def _ntp_calibrate(self, servers: list[str] | None = None) -> tuple[float, float] | None:
-        """NTP sunucusundan ms-hassasiyetinde offset ve delay ölç.
+    def _ntp_calibrate(self, servers: list[str] | None = None) -> tuple[int, int] | None:
+        """NTP sunucusundan ns-tamsayı offset ve delay ölç.
 
         NTP offset = sunucu_saati - yerel_saat.
         Pozitif: NTP sunucusu ileride, negatif: geride.
 
-        Returns: (offset_seconds, delay_seconds) veya None
+        Returns: (offset_ns, delay_ns) veya None
         """
-        import ntplib
         servers = servers or [
             "time.google.com",      # Google — Cloud Run ile aynı altyapı
             "time.cloudflare.com",  # Cloudflare — düşük RTT
@@ -455,21 +890,20 @@ class RegistrationEngine:
         best_result = None
         for server in servers:
             try:
-                client = ntplib.NTPClient()
-                resp = client.request(server, version=3, timeout=3)
+                offset_ns, delay_ns = sntp_query(server, timeout=3)
                 # En düşük delay = en doğru ölçüm
-                if best_result is None or resp.delay < best_result[1]:
-                    best_result = (resp.offset, resp.delay)
+                if best_result is None or delay_ns < best_result[1]:
+                    best_result = (offset_ns, delay_ns)
             except Exception:
                 continue
         if best_result:
-            self._last_ntp_delay = best_result[1]
+            self._last_ntp_delay_ns = best_result[1]
         return best_result
 
     def _ntp_offset(self) -> float:
-        """Geriye uyumluluk: sadece offset döner."""
+        """Geriye uyumluluk: sadece offset (sn) döner."""
         result = self._ntp_calibrate()
-        return result[0] if result else 0.0
+        return result[0] / _NS if result else 0.0
 
     # ── Sunucu Offset Ölçümü (NTP birincil + Date doğrulama) ──
 
@@ -531,6 +965,7 @@ class RegistrationEngine:
                 self._log(f"HEAD bağlantısı da başarısız: {e2}", "error")
                 ntp_off = self._ntp_offset()
                 self._calibration = CalibrationData(server_offset=-ntp_off, rtt_one_way=0.010, ntp_offset=ntp_off)
+                self._state_version += 1
                 return self._calibration
 
         # 2. RTT ölçümü (OBS'ye gerçek POST ile)
@@ -539,8 +974,8 @@ class RegistrationEngine:
 
         # 3. NTP ile hassas offset ölçümü (birincil)
         ntp_result = self._ntp_calibrate()
-        ntp_offset_raw = ntp_result[0] if ntp_result else None
-        ntp_delay = ntp_result[1] if ntp_result else None
+        ntp_offset_raw = ntp_result[0] / _NS if ntp_result else None
+        ntp_delay = ntp_result[1] / _NS if ntp_result else None
 
         # 4. Date header ile cross-validation
         date_offset = self._measure_date_offset()
@@ -606,20 +1041,27 @@ class RegistrationEngine:
 
     # ── Hafif Kalibrasyon (bekleme sırasında periyodik) ──
 
-    def _quick_calibrate(self, source: str = "auto") -> CalibrationData | None:
-        """NTP tabanlı hafif kalibrasyon + RTT ölçümü. ~1-2 saniye sürer."""
+    def _quick_measure(self) -> tuple[float, float, float, float] | None:
+        """Hafif kalibrasyonun ağ kısmı (NTP + RTT, ~1-2 sn) — arka plan işçisinde çalışır.
+        Engine durumuna/event'lere dokunmaz; sonuç run döngüsünde _apply_quick_calibration ile işlenir.
+        → (server_offset, medyan_rtt, ntp_offset, ntp_delay) sn; NTP başarısızsa None."""
+        # 1. NTP ile hassas offset ölçümü
+        ntp_result = self._ntp_calibrate()
+        if ntp_result is None:
+            return None
+        ntp_offset_raw, ntp_delay = ntp_result[0] / _NS, ntp_result[1] / _NS
+        # 2. RTT ölçümü (OBS'ye POST ile); offset işareti çevrilir: yerel - sunucu
+        return -ntp_offset_raw, self._rtt_olc(3), ntp_offset_raw, ntp_delay
+
+    def _apply_quick_calibration(self, fut: Future, source: str = "auto") -> CalibrationData | None:
+        """Biten _quick_measure sonucunu havuza işle ve yayınla — run döngüsü thread'inde
+        (state_version/tetik tek thread'den değişir, havuz sayım okurken güncellenmez)."""
         try:
-            # 1. NTP ile hassas offset ölçümü
-            ntp_result = self._ntp_calibrate()
-            if ntp_result is None:
+            measured = fut.result()
+            if measured is None:
                 self._log("⚡ Hızlı kal: NTP başarısız, atlanıyor", "warning")
                 return None
-
-            ntp_offset_raw, ntp_delay = ntp_result
-            server_offset = -ntp_offset_raw  # işareti çevir: yerel - sunucu
-
-            # 2. RTT ölçümü (OBS'ye POST ile)
-            medyan_rtt = self._rtt_olc(3)
+            server_offset, medyan_rtt, ntp_offset_raw, ntp_delay = measured
 
             # 3. Havuza ekle (outlier filtresi _add_sample içinde)
             self._add_sample(server_offset, medyan_rtt, source)
@@ -659,18 +1101,121 @@ class RegistrationEngine:
             self.session.post(OBS_URL, json={"ECRN": ["00000"], "SCRN": []}, timeout=10)
             if not head_only:
                 self.session.post(OBS_URL, json={"ECRN": ["00000"], "SCRN": []}, timeout=10)
-            self._log("Bağlantı hazır" + (" (HEAD only)" if head_only else ""))
+            # Tetik bağlantısı: TCP + TLS el sıkışmasını şimdi yap
+            self._open_raw_conn()
+            tls = " | TLS oturumu devam" if any(c.resumed for c in self._conns) else ""
+            self._log("Bağlantı hazır" + (" (HEAD only)" if head_only else "") + tls)
         except Exception as e:
             self._log(f"Prewarm hatası: {e}", "warning")
 
-    # ── PreparedRequest ──
+    # ── Tetik bağlantıları (sadece kayıt POST'u) ──
+
+    def _release_workers(self):
+        """Arka plan havuzlarını kapat, tetik bağlantılarını bırak (run() sonu / tek seferlik kullanım)."""
+        self._keepalive_stop.set()
+        self._keepalive_pool.shutdown(wait=False, cancel_futures=True)
+        self._cal_pool.shutdown(wait=False, cancel_futures=True)
+        self._close_raw_conn()
+        if self._send_pool is not None:
+            self._send_pool.shutdown(wait=False)
+
+    def _open_raw_conn(self):
+        """Tüm tetik bağlantılarını (yeniden) aç — TCP + TLS el sıkışması şimdi yapılır.
+        Ardından HEAD atılır: TLS oturum ticket'ı alınır, kopma sonrası yeniden bağlanma kısalır."""
+        for conn in self._conns:
+            conn.open()
+            try:
+                conn.send(self._head_request, method="HEAD")
+            except (http.client.HTTPException, OSError):
+                pass
+
+    def _close_raw_conn(self):
+        for conn in self._conns:
+            conn.close()
 
-    def _build_request(self, ecrn_list: list[str]) -> requests.PreparedRequest:
-        req = requests.Request(
-            method="POST", url=OBS_URL,
-            json={"ECRN": ecrn_list, "SCRN": self.scrn_list},
+    def _raw_keepalive(self) -> float | None:
+        """Tetik bağlantılarını HEAD ile canlı tut (POST debounce tetikler!). İlk bağlantının RTT'si (sn) döner."""
+        rtt = None
+        for i, conn in enumerate(self._conns):
+            if self._keepalive_stop.is_set():
+                break
+            gen = conn.generation
+            t0 = time.perf_counter()
+            try:
+                conn.send(self._head_request, method="HEAD")
+            except (http.client.HTTPException, OSError):
+                # Kopmuş bağlantıyı tetikten önce yenile (tetik yaklaştıysa dokunma).
+                # Takılı HEAD'den geç uyandıysak tetik bağlantıyı çoktan kapatıp yeniden açmış
+                # olabilir → nesil değiştiyse open() hiçbir şeye dokunmaz.
+                if self._keepalive_stop.is_set():
+                    break
+                try:
+                    conn.open(expect_generation=gen)
+                except OSError:
+                    pass
+                continue
+            if i == 0:
+                rtt = time.perf_counter() - t0
+        return rtt
+
+    def _submit_keepalive(self, on_done: Callable[[float | None], None] | None = None):
+        """_raw_keepalive'ı arka planda çalıştır. Önceki hâlâ sürüyorsa yenisini kuyruğa ekleme."""
+        if self._keepalive_future is not None and not self._keepalive_future.done():
+            return
+        fut = self._keepalive_pool.submit(self._raw_keepalive)
+        if on_done is not None:
+            # İptal edilmiş future'da exception() CancelledError fırlatır → önce cancelled()
+            fut.add_done_callback(lambda f: on_done(None if f.cancelled() or f.exception() else f.result()))
+        self._keepalive_future = fut
+
+    def _drain_keepalive(self, timeout: float):
+        """Tetikten önce bekleyen keepalive'ı iptal et / bitmesini bekle — bağlantılar tetiğe kalsın."""
+        fut, self._keepalive_future = self._keepalive_future, None
+        if fut is None or fut.cancel() or fut.done():
+            return
+        try:
+            fut.result(timeout=max(0.0, timeout))
+        except Exception:
+            # Takılmış HEAD: işçiyi durdur, bağlantıları kapat → tetik POST'u temiz bağlantı açar
+            self._keepalive_stop.set()
+            self._log("⚠️ Keepalive tetikten önce bitmedi — tetik bağlantıları sıfırlandı", "warning")
+            self._close_raw_conn()
+
+    # ── Hazır istek buffer'ı ──
+
+    def _build_request(self, ecrn_list: list[str]) -> bytes:
+        """İstek satırı + sabit header bloğu + gövde → tek bytes (CRN listesi değişince yeniden kurulur)."""
+        crn_json = self._crn_json
+        body = b'{"ECRN":[' + b",".join([crn_json[c] for c in ecrn_list]) + self._body_tail
+        return (
+            _POST_LINE
+            + self._header_bytes
+            + f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
         )
-        return self.session.prepare_request(req)
+
+    def _build_batches(self, kalan: list[str]) -> list[tuple[int, bytes, int]]:
+        """Kalan CRN'leri sabit shard'larına göre grupla → [(bağlantı indeksi, hazır istek, CRN sayısı), ...]."""
+        groups: list[list[str]] = [[] for _ in self._conns]
+        for crn in kalan:
+            groups[self._shard_of[crn]].append(crn)
+        return [(i, self._build_request(g), len(g)) for i, g in enumerate(groups) if g]
+
+    def _send_batch(self, conn_idx: int, request_bytes: bytes):
+        """Tek shard gönder → (status, headers, body, ms) veya bağlantı hatası."""
+        t0 = time.perf_counter()
+        try:
+            status, headers, content = self._conns[conn_idx].send(request_bytes)
+        except (http.client.HTTPException, OSError) as e:
+            return e
+        return status, headers, content, (time.perf_counter() - t0) * 1000
+
+    def _send_batches(self, batches: list[tuple[int, bytes, int]]) -> list:
+        """Shard'ları eşzamanlı gönder. Her deneme tüm yanıtları bekler →
+        aynı CRN için istekler asla üst üste binmez."""
+        if len(batches) == 1:
+            return [self._send_batch(batches[0][0], batches[0][1])]
+        return list(self._send_pool.map(lambda b: self._send_batch(b[0], b[1]), batches))
 
     # ── Dry-Run Simülasyonu ──
 
@@ -680,6 +1225,7 @@ class RegistrationEngine:
 
         for crn in kalan:
             self._crn_results[crn] = {"status": "pending", "message": "Bekliyor (DRY RUN)"}
+        self._snapshot_results()
 
         self._log("═══════════════════════════════════", "warning")
         self._log("🧪 DRY RUN — Zamanlama Analizi", "warning")
@@ -762,14 +1308,17 @@ class RegistrationEngine:
             self._current_attempt = deneme
             if deneme <= 2:
                 for crn in kalan:
-                    self._crn_results[crn] = {"status": "debounce", "message": "DRY RUN: Sistem henüz açılmadı"}
-                self._emit("crn_update", {"results": dict(self._crn_results)})
+                    self._set_result(crn, "debounce", "DRY RUN: Sistem henüz açılmadı")
+                if self._results_dirty:
+                    self._results_dirty = False
+                    self._emit("crn_update", {"results": self._crn_results.copy()})
                 time.sleep(0.1)
             else:
-                for crn in list(kalan):
-                    self._crn_results[crn] = {"status": "success", "message": "DRY RUN: Simüle edilmiş başarı"}
-                    kalan.remove(crn)
-                self._emit("crn_update", {"results": dict(self._crn_results)})
+                for crn in kalan:
+                    self._set_result(crn, "success", "DRY RUN: Simüle edilmiş başarı")
+                kalan.clear()
+                self._results_dirty = False
+                self._emit("crn_update", {"results": self._crn_results.copy()})
                 break
 
         basarili = len(self.ecrn_list) - len(kalan)
@@ -777,6 +1326,116 @@ class RegistrationEngine:
 
     # ── Kayıt Döngüsü ──
 
+    def _set_result(self, crn: str, status: str, message: str):
+        """CRN sonucunu güncelle; yalnızca gerçekten değiştiyse crn_update için işaretle."""
+        yeni = {"status": status, "message": message}
+        if self._crn_results.get(crn) != yeni:
+            self._crn_results[crn] = yeni
+            self._results_dirty = True
+
+    # ── Sonuç kodu işleyicileri ──
+    # İmza: (crn, rd, deneme, kalan, basarili, basarisiz) → CRN kalan'dan çıktıysa True
+    # (kalan burada set — üyelik/çıkarma O(1); liste sırası _process_results sonunda korunur)
+
+    @staticmethod
+    def _mark_done(crn: str, kalan: set[str], basarili: list[str]) -> bool:
+        if crn in kalan:
+            kalan.discard(crn)
+            basarili.append(crn)
+            return True
+        return False
+
+    @staticmethod
+    def _mark_failed(crn: str, kalan: set[str], basarisiz: dict, reason: str) -> bool:
+        if crn in kalan:
+            kalan.discard(crn)
+            basarisiz[crn] = reason
+            return True
+        return False
+
+    def _h_success(self, crn, rd, deneme, kalan, basarili, basarisiz) -> bool:
+        self._log(f"✅ {crn} → BAŞARILI!")
+        self._set_result(crn, "success", "Kayıt başarılı")
+        return self._mark_done(crn, kalan, basarili)
+
+    def _h_val03(self, crn, rd, deneme, kalan, basarili, basarisiz) -> bool:
+        self._log(f"✅ {crn} → Zaten alınmış")
+        self._set_result(crn, "already", "Zaten kayıtlı")
+        return self._mark_done(crn, kalan, basarili)
+
+    def _h_val02(self, crn, rd, deneme, kalan, basarili, basarisiz) -> bool:
+        if deneme <= 2:
+            self._log(f"⏳ {crn} → Sistem henüz açılmadı")
+        return False
+
+    def _h_val16(self, crn, rd, deneme, kalan, basarili, basarisiz) -> bool:
+        if deneme <= 2:
+            self._log(f"⚠️ {crn} → Debounce")
+        self._set_result(crn, "debounce", "Debounce — tekrar denenecek")
+        return False
+
+    def _h_val06(self, crn, rd, deneme, kalan, basarili, basarisiz) -> bool:
+        self._log(f"🚫 {crn} → KONTENJAN DOLU", "error")
+        self._set_result(crn, "full", "Kontenjan dolu")
+        return self._mark_failed(crn, kalan, basarisiz, "Kontenjan dolu")
+
+    def _h_val09(self, crn, rd, deneme, kalan, basarili, basarisiz) -> bool:
+        self._log(f"⚠️ {crn} → Çakışma", "warning")
+        self._set_result(crn, "conflict", "Ders çakışması")
+        return self._mark_failed(crn, kalan, basarisiz, "Çakışma")
+
+    def _h_val22(self, crn, rd, deneme, kalan, basarili, basarisiz) -> bool:
+        d = rd.get("yukseltmeyeAlinanDers", "?") if rd else "?"
+        self._log(f"📚 {crn} → Yükseltme çakışması: {d}", "warning")
+        self._set_result(crn, "upgrade", f"Yükseltme: {d}")
+        return self._mark_failed(crn, kalan, basarisiz, f"Yükseltme: {d}")
+
+    def _h_default(self, crn, rd, deneme, kalan, basarili, basarisiz, rc=None) -> bool:
+        desc = HATA_KODLARI.get(rc, rc)
+        self._log(f"❌ {crn} → {desc}", "error")
+        self._set_result(crn, "error", desc)
+        return self._mark_failed(crn, kalan, basarisiz, desc)
+
+    # resultCode → işleyici (sınıf tanımında bir kez kurulur)
+    _RC_HANDLERS = {
+        "VAL02": _h_val02,
+        "VAL03": _h_val03,
+        "VAL06": _h_val06,
+        "VAL09": _h_val09,
+        "VAL16": _h_val16,
+        "VAL22": _h_val22,
+    }
+
+    def _process_results(self, data: dict, deneme: int, kalan: list[str], basarili: list[str], basarisiz: dict) -> tuple[bool, bool]:
+        """ecrnResultList'i işle → (crn_degisti, tum_val02)."""
+        crn_degisti = False
+        tum_val02 = True
+        handlers = self._RC_HANDLERS
+        acik = set(kalan)
+        for item in (data.get("ecrnResultList") or ()):
+            try:
+                crn, sc, rc, rd = _RESULT_FIELDS(item)
+            except KeyError:
+                # Başarılı kayıtlarda resultCode/resultData gelmeyebilir
+                crn, sc, rc, rd = map(item.get, _RESULT_KEYS)
+
+            if rc not in RETRYABLE_CODES:
+                tum_val02 = False
+
+            if sc == 0:
+                degisti = self._h_success(crn, rd, deneme, acik, basarili, basarisiz)
+            else:
+                handler = handlers.get(rc)
+                if handler is not None:
+                    degisti = handler(self, crn, rd, deneme, acik, basarili, basarisiz)
+                else:
+                    degisti = self._h_default(crn, rd, deneme, acik, basarili, basarisiz, rc)
+            crn_degisti = crn_degisti or degisti
+
+        if crn_degisti:
+            kalan[:] = [c for c in kalan if c in acik]
+        return crn_degisti, tum_val02
+
     def _kayit_yap(self):
         kalan = list(self.ecrn_list)
         basarili = []
@@ -786,128 +1445,104 @@ class RegistrationEngine:
         # CRN sonuçlarını başlat
         for crn in kalan:
             self._crn_results[crn] = {"status": "pending", "message": "Bekliyor"}
+        self._snapshot_results()
+        self._results_dirty = True  # ilk yanıtta bekleyen durum da gönderilsin
 
-        prepped = self._build_request(kalan)
+        batches = self._initial_batches
         ilk = True
         crn_degisti = False
-
-        for deneme in range(1, self.max_deneme + 1):
-            if not kalan or self._cancelled.is_set():
+        hizli_retry = 0  # ardışık VAL02-dışı retry sayısı (RETRY_SCHEDULE_MS indeksi)
+        rate_ardisik = 0  # ardışık 429 sayısı (üstel geri çekilme)
+
+        # Döngüde sık kullanılanlar yerel isimlere (LOAD_FAST)
+        log = self._log
+        emit = self._emit
+        results = self._crn_results
+        cancelled = self._cancelled.is_set
+        send_batches = self._send_batches
+        process_results = self._process_results
+        json_loads = _json_loads
+        sleep = time.sleep
+        retry_aralik = self.retry_aralik
+        max_deneme = self.max_deneme
+        schedule = RETRY_SCHEDULE_MS
+        schedule_son = len(schedule) - 1
+
+        for deneme in range(1, max_deneme + 1):
+            if not kalan or cancelled():
                 break
 
             self._current_attempt = deneme
-            t0 = time.perf_counter()
 
             if not ilk:
                 if crn_degisti:
-                    prepped = self._build_request(kalan)
+                    batches = self._build_batches(kalan)
                     crn_degisti = False
 
-            try:
-                resp = self.session.send(prepped, timeout=10)
-            except requests.exceptions.RequestException as e:
-                self._log(f"Bağlantı hatası: {e}", "error")
-                time.sleep(aralik)
-                ilk = False
-                continue
-
-            ms = (time.perf_counter() - t0) * 1000
             tag = "İLK İSTEK" if ilk else f"D{deneme}"
-            self._log(f"{tag} → {ms:.0f}ms | HTTP {resp.status_code}")
             ilk = False
+            tum_val02 = True
+            yanit_var = False
+            baglanti_hatasi = False
+            yetkisiz = False
+            rate_wait = 0
+
+            # Paralel shard'lar: her yanıt ayrı işlenir, karar deneme sonunda toplu verilir
+            for (conn_idx, _, n_crn), res in zip(batches, send_batches(batches)):
+                if isinstance(res, Exception):
+                    log(f"Bağlantı hatası: {res}", "error")
+                    baglanti_hatasi = True
+                    continue
 
-            if resp.status_code == 429:
-                wait = int(resp.headers.get("Retry-After", "5"))
-                self._log(f"RATE LIMIT! {wait}sn bekleniyor...", "warning")
-                aralik = min(max(aralik * 3, 1.0), 5.0)
-                time.sleep(wait)
-                continue
+                status, headers, content, ms = res
+                shard_tag = tag if len(batches) == 1 else f"{tag} #{conn_idx}"
+                log(f"{shard_tag} → {ms:.0f}ms | HTTP {status}")
+
+                if status == 429:
+                    rate_wait = max(rate_wait, rate_limit_wait(headers.get("Retry-After"), rate_ardisik))
+                elif status in (401, 403):
+                    log(f"HTTP {status} — Token geçersiz!", "error")
+                    yetkisiz = True
+                elif status == 200:
+                    yanit_var = True
+                    # Açılış öncesi duvar: yanıt tamamen VAL02 ise parse etmeye gerek yok
+                    # (ilk 2 denemede CRN başına log basıldığı için tam yol)
+                    if deneme > 2 and _all_val02(content, n_crn):
+                        continue
+                    degisti, hepsi_val02 = process_results(json_loads(content), deneme, kalan, basarili, basarisiz)
+                    crn_degisti = crn_degisti or degisti
+                    tum_val02 = tum_val02 and hepsi_val02
+                else:
+                    tum_val02 = False
+                    log(f"HTTP {status}: {content[:200].decode('utf-8', 'replace')}", "error")
 
-            if resp.status_code in (401, 403):
-                self._log(f"HTTP {resp.status_code} — Token geçersiz!", "error")
+            # Yalnızca değişiklik varsa (tüm-VAL02 denemelerinde gönderim yok)
+            if yanit_var and self._results_dirty:
+                self._results_dirty = False
+                emit("crn_update", {"results": results.copy()})
+
+            if yetkisiz:
                 break
 
-            tum_val02 = True
+            if rate_wait:
+                rate_ardisik += 1
+                log(f"RATE LIMIT! {rate_wait:.1f}sn bekleniyor...", "warning")
+                aralik = min(max(aralik * 3, 1.0), 5.0)
+                sleep(rate_wait)
+                continue
+            rate_ardisik = 0
 
-            if resp.status_code == 200:
-                data = resp.json()
-                for item in (data.get("ecrnResultList") or []):
-                    crn = item.get("crn")
-                    sc = item.get("statusCode")
-                    rc = item.get("resultCode")
-                    rd = item.get("resultData")
-
-                    if rc not in ("VAL02", "VAL16"):
-                        tum_val02 = False
-
-                    if sc == 0:
-                        self._log(f"✅ {crn} → BAŞARILI!")
-                        self._crn_results[crn] = {"status": "success", "message": "Kayıt başarılı"}
-                        if crn in kalan:
-                            kalan.remove(crn)
-                            basarili.append(crn)
-                            crn_degisti = True
-
-                    elif rc == "VAL03":
-                        self._log(f"✅ {crn} → Zaten alınmış")
-                        self._crn_results[crn] = {"status": "already", "message": "Zaten kayıtlı"}
-                        if crn in kalan:
-                            kalan.remove(crn)
-                            basarili.append(crn)
-                            crn_degisti = True
-
-                    elif rc == "VAL02":
-                        if deneme <= 2:
-                            self._log(f"⏳ {crn} → Sistem henüz açılmadı")
-
-                    elif rc == "VAL16":
-                        if deneme <= 2:
-                            self._log(f"⚠️ {crn} → Debounce")
-                        self._crn_results[crn] = {"status": "debounce", "message": "Debounce — tekrar denenecek"}
-
-                    elif rc == "VAL06":
-                        self._log(f"🚫 {crn} → KONTENJAN DOLU", "error")
-                        self._crn_results[crn] = {"status": "full", "message": "Kontenjan dolu"}
-                        if crn in kalan:
-                            kalan.remove(crn)
-                            basarisiz[crn] = "Kontenjan dolu"
-                            crn_degisti = True
-
-                    elif rc == "VAL09":
-                        self._log(f"⚠️ {crn} → Çakışma", "warning")
-                        self._crn_results[crn] = {"status": "conflict", "message": "Ders çakışması"}
-                        if crn in kalan:
-                            kalan.remove(crn)
-                            basarisiz[crn] = "Çakışma"
-                            crn_degisti = True
-
-                    elif rc == "VAL22":
-                        d = rd.get("yukseltmeyeAlinanDers", "?") if rd else "?"
-                        self._log(f"📚 {crn} → Yükseltme çakışması: {d}", "warning")
-                        self._crn_results[crn] = {"status": "upgrade", "message": f"Yükseltme: {d}"}
-                        if crn in kalan:
-                            kalan.remove(crn)
-                            basarisiz[crn] = f"Yükseltme: {d}"
-                            crn_degisti = True
-                    else:
-                        desc = HATA_KODLARI.get(rc, rc)
-                        self._log(f"❌ {crn} → {desc}", "error")
-                        self._crn_results[crn] = {"status": "error", "message": desc}
-                        if crn in kalan:
-                            kalan.remove(crn)
-                            basarisiz[crn] = desc
-                            crn_degisti = True
-
-                self._emit("crn_update", {"results": dict(self._crn_results)})
-            else:
-                tum_val02 = False
-                self._log(f"HTTP {resp.status_code}: {resp.text[:200]}", "error")
+            if baglanti_hatasi:
+                sleep(aralik)
+                continue
 
-            if kalan and deneme < self.max_deneme:
+            if kalan and deneme < max_deneme:
                 if tum_val02:
-                    time.sleep(self.retry_aralik)
+                    hizli_retry = 0
+                    sleep(retry_aralik)
                 else:
-                    time.sleep(0.05)
+                    _precise_sleep(schedule[min(hizli_retry, schedule_son)] / 1000)
+                    hizli_retry += 1
 
         # Özet
         self._log(f"Başarılı: {len(basarili)}/{len(self.ecrn_list)}")
@@ -922,16 +1557,8 @@ class RegistrationEngine:
     @staticmethod
     def _saat_to_epoch(saat_str: str) -> float:
         """HH:MM:SS → bugünün epoch float (Türkiye saati, sunucu timezone'undan bağımsız)."""
-        from datetime import datetime
-        try:
-            from zoneinfo import ZoneInfo
-        except ImportError:
-            from backports.zoneinfo import ZoneInfo  # Python <3.9 fallback
-        h, m, s = map(int, saat_str.split(":"))
-        tz = ZoneInfo("Europe/Istanbul")
-        now = datetime.now(tz)
-        target = now.replace(hour=h, minute=m, second=s, microsecond=0)
-        return target.timestamp()
+        bugun = datetime.now(_TZ_IST).date().toordinal()
+        return _saat_epoch_cached(saat_str, bugun)
 
     # ── Sistem Optimizasyonları ──
 
@@ -975,6 +1602,8 @@ class RegistrationEngine:
                 opts.append("cpu=0")
             except (AttributeError, OSError):
                 pass
+            if _set_ioprio_rt():
+                opts.append("ioprio=RT")
             if opts:
                 self._log(f"⚡ Linux optimizasyonları: {', '.join(opts)}")
 
@@ -1041,7 +1670,7 @@ class RegistrationEngine:
             # GELIŞMIŞ KORUMA MEKANIZMALARI UYGULA
             final_trigger = self._apply_advanced_protection(base_trigger, hedef)
             
-            self._trigger_time = final_trigger
+            self._set_trigger_time(final_trigger)
 
             kalan_sn = final_trigger - time.time()
             self._log(f"Tetik: {self.kayit_saati} +{self._measurement_buffer*1000:.0f}ms buffer | {kalan_sn:.1f}s kaldı")
@@ -1062,15 +1691,36 @@ class RegistrationEngine:
             gc.disable()  # GC pause'u engelle (tetik hassasiyeti için)
             self._log("🗑️ GC devre dışı (tetik hassasiyeti)", "info")
             prewarm2 = False
-            keepalive_5s = False
-            keepalive_3s = False
-            final_cal_done = False
-            probe_done = False
             last_recal_time = time.time()
-            RECAL_INTERVAL = 30  # her X saniyede hafif kalibrasyon
-            FINAL_CAL_WINDOW = 20  # son tam kalibrasyon bu saniyede başlar
-            FINAL_CAL_MIN = 10  # bundan yakın olursa zaten yapma
+            # Pencereler yerel değişkenlere açılır (döngüde attribute lookup yok)
+            RECAL_INTERVAL = WAIT.recal_interval
+            RECAL_MIN = WAIT.recal_min
+            FINAL_CAL_MIN, FINAL_CAL_WINDOW = WAIT.final_cal
+            PREWARM = WAIT.prewarm
+            K1_LO, K1_HI = WAIT.keepalive1
+            K2_LO, K2_HI = WAIT.keepalive2
+            PROBE_LO, PROBE_HI = WAIT.probe
+            RTT_WATCH_MIN = WAIT.rtt_watch_min
+            DRAIN = WAIT.drain
+            COUNTDOWN_FINE = WAIT.countdown_fine
+            TICK = WAIT.tick
+            BUSY_WAIT = WAIT.busy_wait
             recal_count = 0
+            COUNTDOWN_MIN_NS = 100_000_000  # countdown event'leri en fazla 10 Hz
+            son_countdown_ns = 0
+
+            # Olay takvimi: (-eşik, olay) — kalan süre eşiğe inince olay çalışır.
+            # Eşikler tetiğe göreli olduğundan tetik kayınca yeniden sıralamaya gerek yok.
+            takvim = [
+                (-FINAL_CAL_WINDOW, "final_cal"),
+                (-PREWARM, "prewarm"),
+                (-K1_HI, "keepalive1"),
+                (-K2_HI, "keepalive2"),
+                (-PROBE_HI, "probe"),
+                (-DRAIN, "drain"),
+                (-BUSY_WAIT, "busy_wait"),
+            ]
+            heapq.heapify(takvim)
 
             def _recalc_trigger():
                 """Havuzdaki en iyi ölçüme göre tetik zamanını yeniden hesapla."""
@@ -1089,65 +1739,40 @@ class RegistrationEngine:
                     return new_trigger
                 return final_trigger
 
+            tetiklendi = False
+            cal_future = None
             while not self._cancelled.is_set():
                 now = time.time()
                 kalan = final_trigger - now
 
-                # Countdown event (her saniye)
-                self._emit("countdown", {"trigger_time": final_trigger, "remaining": kalan})
+                # Countdown event (en fazla 10 Hz; son 2sn'de her tur)
+                simdi_ns = time.perf_counter_ns()
+                if kalan < COUNTDOWN_FINE or simdi_ns - son_countdown_ns >= COUNTDOWN_MIN_NS:
+                    self._emit("countdown", {"trigger_time": final_trigger, "remaining": kalan})
+                    son_countdown_ns = simdi_ns
 
-                # ── Periyodik hafif kalibrasyon (>25sn kala, her 30sn) ──
-                if kalan > 25 and (now - last_recal_time) >= RECAL_INTERVAL:
+                # ── Periyodik hafif kalibrasyon (>25sn kala, her 30sn — arka planda) ──
+                if cal_future is None and kalan > RECAL_MIN and (now - last_recal_time) >= RECAL_INTERVAL:
                     recal_count += 1
                     self._log(f"🔄 Periyodik kalibrasyon #{recal_count}...")
-                    self._quick_calibrate(source="auto")
-                    eski_tetik = final_trigger
-                    final_trigger = _recalc_trigger()
-                    self._trigger_time = final_trigger
-                    fark = (final_trigger - eski_tetik) * 1000
-                    if abs(fark) > 1:
-                        self._log(f"🔄 Tetik güncellendi: {fark:+.0f}ms kayma (en iyi RTT: {self._calibration.rtt_one_way*1000:.0f}ms)")
-                    kalan = final_trigger - time.time()
+                    cal_future = self._cal_pool.submit(self._quick_measure)
                     last_recal_time = now
 
-                # ── Son TAM kalibrasyon (35-45sn kala) ──
-                if not final_cal_done and FINAL_CAL_MIN < kalan <= FINAL_CAL_WINDOW:
-                    self._log("🎯 Son tam kalibrasyon başlıyor...")
-                    self.calibrate(source="final")
+                # Kalibrasyon bitti → tetiği güncelle (sayım bu sırada durmadı)
+                if cal_future is not None and cal_future.done():
+                    self._apply_quick_calibration(cal_future, "auto")
+                    cal_future = None
                     eski_tetik = final_trigger
                     final_trigger = _recalc_trigger()
-                    self._trigger_time = final_trigger
+                    self._set_trigger_time(final_trigger)
                     fark = (final_trigger - eski_tetik) * 1000
-                    best = self._best_calibration()
-                    self._log(f"🎯 Son kalibrasyon tamam → tetik farkı: {fark:+.0f}ms | en iyi: offset={best.server_offset*1000:+.0f}ms RTT={best.rtt_one_way*1000:.0f}ms [havuz:{len(self._cal_samples)}]")
+                    if abs(fark) > 1:
+                        self._log(f"🔄 Tetik güncellendi: {fark:+.0f}ms kayma (en iyi RTT: {self._calibration.rtt_one_way*1000:.0f}ms)")
                     kalan = final_trigger - time.time()
-                    self._emit("countdown", {"trigger_time": final_trigger, "remaining": kalan})
-                    final_cal_done = True
-                    # Final sonrası bağlantıyı tekrar ısıt
-                    self._prewarm(head_only=True)
-                    prewarm2 = True
-
-                # ── Bağlantı canlı tutma (10s, 5s, 3.5s kala — HEAD ile, debounce riski sıfır) ──
-                if not prewarm2 and 0 < kalan <= 10:
-                    self._prewarm(head_only=True)
-                    prewarm2 = True
-                elif prewarm2 and not keepalive_5s and 4.5 < kalan <= 5.5:
-                    keepalive_5s = True
-                    try:
-                        # HEAD isteği ile bağlantı canlı tutma (POST debounce tetikler!)
-                        self.session.head(OBS_URL, timeout=10)
-                    except Exception:
-                        pass
-                elif keepalive_5s and not keepalive_3s and 3.0 < kalan <= 4.0:
-                    keepalive_3s = True
-                    try:
-                        # HEAD isteği ile bağlantı canlı tutma (POST debounce tetikler!)
-                        self.session.head(OBS_URL, timeout=10)
-                    except Exception:
-                        pass
 
                 # ── Sürekli RTT izleme ve düzeltme (kalan > 5sn ve 30sn aralıklarla) ──
-                if kalan > 5 and (now - last_recal_time) >= 30:  # 30sn aralıklarla
+                # (arka plan kalibrasyonu sürerken ölçüm havuzuna dokunma)
+                if cal_future is None and kalan > RTT_WATCH_MIN and (now - last_recal_time) >= RECAL_INTERVAL:
                     # RTT trend izleme
                     rtt_trend_data = self._rtt_stats(5)
                     self._log(f"📊 Sürekli RTT izleme: median={rtt_trend_data['median']*1000:.0f}ms, trend={rtt_trend_data['trend']*1000:+.1f}ms", "info")
@@ -1161,32 +1786,92 @@ class RegistrationEngine:
                     
                     last_recal_time = now
 
-                # ── Son saniye bağlantı kontrolü (2s kala — HEAD ile, debounce riski sıfır) ──
-                if not probe_done and 1.5 < kalan <= 2.5:
-                    probe_done = True
-                    # HEAD ile bağlantı kontrol (POST debounce tetikler, tehlikeli!)
-                    try:
-                        t0 = time.perf_counter()
-                        self.session.head(OBS_URL, timeout=5)
-                        head_rtt = (time.perf_counter() - t0) * 1000
-                        self._log(f"🎯 Bağlantı kontrol (HEAD): {head_rtt:.0f}ms — POST probe kaldırıldı (debounce riski)")
-                    except Exception:
-                        self._log("⚠️ Bağlantı kontrol başarısız (HEAD)", "warning")
-
-                # ── Busy-wait (son 50ms — perf_counter ile yüksek çözünürlük) ──
-                if kalan <= 0.05:
-                    pc_tetik = time.perf_counter() + (final_trigger - time.time())
-                    while time.perf_counter() < pc_tetik:
-                        pass
+                # ── Zamanı gelen olaylar (eşik sırasıyla; penceresi kaçmış olan atlanır) ──
+                while takvim and kalan <= -takvim[0][0]:
+                    _, olay = heapq.heappop(takvim)
+
+                    if olay == "final_cal":
+                        # Son TAM kalibrasyon (10-20sn kala)
+                        if kalan <= FINAL_CAL_MIN:
+                            continue
+                        if cal_future is not None:
+                            # Süren periyodik kalibrasyonu bekle (aynı ölçüm havuzu)
+                            try:
+                                cal_future.result(timeout=max(0.0, kalan - FINAL_CAL_MIN))
+                            except Exception:
+                                pass
+                            if cal_future.done():
+                                self._apply_quick_calibration(cal_future, "auto")
+                            cal_future = None
+                        self._log("🎯 Son tam kalibrasyon başlıyor...")
+                        self.calibrate(source="final")
+                        eski_tetik = final_trigger
+                        final_trigger = _recalc_trigger()
+                        self._set_trigger_time(final_trigger)
+                        fark = (final_trigger - eski_tetik) * 1000
+                        best = self._best_calibration()
+                        self._log(f"🎯 Son kalibrasyon tamam → tetik farkı: {fark:+.0f}ms | en iyi: offset={best.server_offset*1000:+.0f}ms RTT={best.rtt_one_way*1000:.0f}ms [havuz:{len(self._cal_samples)}]")
+                        kalan = final_trigger - time.time()
+                        self._emit("countdown", {"trigger_time": final_trigger, "remaining": kalan})
+                        # Final sonrası bağlantıyı tekrar ısıt (tetik yaklaştıysa bloklayan HEAD yok)
+                        if kalan > BUSY_WAIT:
+                            self._prewarm(head_only=True)
+                        prewarm2 = True
+
+                    elif olay == "prewarm":
+                        # Bağlantı canlı tutma (10s kala — HEAD ile, debounce riski sıfır).
+                        # Geç başlangıç / tetik kayması: busy-wait penceresindeysek atla, POST gecikmesin
+                        if not prewarm2:
+                            if kalan > BUSY_WAIT:
+                                self._prewarm(head_only=True)
+                            prewarm2 = True
+
+                    elif olay == "keepalive1":
+                        # Tetik bağlantısını HEAD ile canlı tut (POST debounce tetikler!) — arka planda
+                        if kalan > K1_LO:
+                            self._submit_keepalive()
+
+                    elif olay == "keepalive2":
+                        if kalan > K2_LO:
+                            self._submit_keepalive()
+
+                    elif olay == "probe":
+                        # Son saniye bağlantı kontrolü (2s kala — HEAD ile, debounce riski sıfır)
+                        if kalan <= PROBE_LO:
+                            continue
+                        # HEAD ile tetik bağlantısını kontrol (POST debounce tetikler, tehlikeli!)
+                        def _probe_log(head_rtt):
+                            if head_rtt is not None:
+                                self._log(f"🎯 Bağlantı kontrol (HEAD): {head_rtt*1000:.0f}ms — POST probe kaldırıldı (debounce riski)")
+                            else:
+                                self._log("⚠️ Bağlantı kontrol başarısız (HEAD) — tetik bağlantısı yenilendi", "warning")
+                        self._submit_keepalive(_probe_log)
+
+                    elif olay == "drain":
+                        # Tetikten önce arka plan keepalive'ı kapat (<1s kala)
+                        if self._keepalive_future is not None:
+                            self._drain_keepalive(kalan - 0.2)
+
+                    elif olay == "busy_wait":
+                        # Busy-wait (son 50ms — perf_counter_ns, tamsayı karşılaştırma)
+                        perf_ns = time.perf_counter_ns
+                        pc_tetik_ns = perf_ns() + int((final_trigger - time.time()) * _NS)
+                        # >1ms kaldıysa CPU'yu bırak (SMT kardeşini boğma), sonra saf spin
+                        yield_sinir_ns = pc_tetik_ns - 1_000_000
+                        while perf_ns() < yield_sinir_ns:
+                            if _sched_yield is not None:
+                                _sched_yield()
+                        while perf_ns() < pc_tetik_ns:
+                            pass
+                        tetiklendi = True
+                        break
+
+                if tetiklendi:
                     break
 
-                # ── Kademeli uyku (gereksiz wakeup'ları minimize et) ──
-                if kalan <= 0.5:
-                    time.sleep(max(0, kalan - 0.05))
-                elif kalan <= 5:
-                    time.sleep(0.005)
-                else:
-                    time.sleep(min(1.0, kalan - 5))
+                # ── Bir sonraki olay eşiğine kadar uyu (countdown/kalibrasyon için en fazla TICK) ──
+                kalan = final_trigger - time.time()
+                time.sleep(max(0.0, min(TICK, kalan + takvim[0][0])))
 
             if self._cancelled.is_set():
                 return
@@ -1206,21 +1891,43 @@ class RegistrationEngine:
             self._log(f"Beklenmeyen hata: {e}", "error")
         finally:
             gc.enable()  # GC'yi tekrar aç
+            self._release_workers()
             self._set_timer_resolution(False)
             self._set_phase("done")
-            self._emit("done", {"results": dict(self._crn_results)})
+            self._emit("done", {"results": self._crn_results.copy()})
             self._running = False  # MUST be last — poll_engine_events checks this flag
 
     # ── Token testi ──
 
     def test_token(self) -> dict:
-        try:
-            r = self.session.post(OBS_URL, json={"ECRN": ["00000"], "SCRN": []}, timeout=10)
-            if r.status_code == 200:
-                return {"valid": True, "status_code": 200, "message": "Token geçerli"}
-            elif r.status_code in (401, 403):
-                return {"valid": False, "status_code": r.status_code, "message": "Token geçersiz veya süresi dolmuş"}
-            else:
-                return {"valid": True, "status_code": r.status_code, "message": f"Sunucu yanıtı: {r.status_code}"}
-        except Exception as e:
-            return {"valid": False, "status_code": 0, "message": str(e)}
+        return _check_token(self.session)
+
+
+# ── Hafif yardımcılar (API uç noktaları için, tam engine kurulumu olmadan) ──
+
+def _check_token(session: requests.Session) -> dict:
+    try:
+        r = session.post(OBS_URL, json={"ECRN": ["00000"], "SCRN": []}, timeout=10)
+        if r.status_code == 200:
+            return {"valid": True, "status_code": 200, "message": "Token geçerli"}
+        elif r.status_code in (401, 403):
+            return {"valid": False, "status_code": r.status_code, "message": "Token geçersiz veya süresi dolmuş"}
+        else:
+            return {"valid": True, "status_code": r.status_code, "message": f"Sunucu yanıtı: {r.status_code}"}
+    except Exception as e:
+        return {"valid": False, "status_code": 0, "message": str(e)}
+
+
+def test_token_light(token: str) -> dict:
+    """Token testi — paylaşılan havuz üzerinden, RegistrationEngine oluşturmadan."""
+    return _check_token(_new_http_session(token, _shared_adapter()))
+
+
+def calibrate_light(token: str, ecrn_list: list[str]) -> CalibrationData:
+    """Manuel kalibrasyon — paylaşılan havuzla, ısınma POST'u açık bağlantıya denk gelir.
+    Geçici engine'in keepalive/kalibrasyon/gönderim havuzları iş bitince kapatılır."""
+    engine = RegistrationEngine(token=token, ecrn_list=ecrn_list, http_adapter=_shared_adapter())
+    try:
+        return engine.calibrate()
+    finally:
+        engine._release_workers()
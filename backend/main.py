@@ -6,15 +6,20 @@ Session bazlı izolasyon: her browser tab kendi bağımsız state'ine sahiptir.
 
 import asyncio
 import json
+import logging
+import logging.handlers
 import os
-import re
+import queue
+import sys
 import time
+import uuid
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from typing import Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, Query
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -22,11 +27,26 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
+try:
+    import orjson
+
+    def _ws_dumps(obj) -> str:
+        # orjson doğrudan UTF-8 bytes üretir; tek decode → tüm client'lara aynı str
+        return orjson.dumps(obj).decode()
+
+    _json_bytes = orjson.dumps
+except ImportError:
+    def _ws_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def _json_bytes(obj) -> bytes:
+        return _ws_dumps(obj).encode()
+
 from models import (
     ConfigRequest, ConfigResponse, CalibrationResult,
-    RegistrationState, TokenTestResult, CRNResultItem, CRNStatus,
+    RegistrationState, TokenTestResult, CRN_RESULTS_ADAPTER, CRN_STATUS_VALUES,
 )
-from engine import RegistrationEngine
+from engine import RegistrationEngine, CalibrationData, Event, test_token_light, calibrate_light
 from obs_course_service import get_obs_service, CourseInfo as OBSCourseInfo
 
 
@@ -41,22 +61,36 @@ class SessionState:
     max_deneme: int = 60
     retry_aralik: float = 3.0
     dry_run: bool = False
+    paralel_baglanti: int = 1
     engine: Optional[RegistrationEngine] = None
     engine_thread: Optional[threading.Thread] = None
     poll_task: Optional[asyncio.Task] = None
-    ws_clients: list = field(default_factory=list)  # list[WebSocket]
+    ws_clients: set[WebSocket] = field(default_factory=set)  # ekle/çıkar/toplu fark O(1)/O(D)
+    stop_event: asyncio.Event = field(default_factory=asyncio.Event)  # event yayınını durdur (reset/cleanup)
+    # Son /status kalibrasyon yanıtı — engine yeni CalibrationData atayana kadar aynı nesne döner
+    cal_cache: Optional[tuple[CalibrationData, CalibrationResult]] = None
     last_active: float = 0.0
 
 
+poll_logger = logging.getLogger("otostop.poll")
+poll_logger.propagate = False  # yalnızca lifespan'daki QueueHandler üzerinden yazılır
+
 sessions: dict[str, SessionState] = {}
 MAX_SESSIONS = 100
 SESSION_TIMEOUT = 7200  # 2 saat
+CLEANUP_INTERVAL = 60  # arka plan session temizliği (sn)
 
-# Session ID format doğrulama (UUIDv4)
-UUID_RE = re.compile(
-    r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$',
-    re.IGNORECASE,
-)
+
+def _is_uuid4(sid: str) -> bool:
+    """Session ID'nin kanonik (36 karakter, tireli) UUIDv4 olduğunu doğrula."""
+    if len(sid) != 36:
+        return False
+    try:
+        u = uuid.UUID(sid)
+    except ValueError:
+        return False
+    # uuid.UUID işaret/boşluk/alt çizgi gibi kanonik olmayan biçimleri de kabul eder
+    return u.version == 4 and u.variant == uuid.RFC_4122 and str(u) == sid.lower()
 
 # Rate limiter (IP bazlı)
 limiter = Limiter(key_func=get_remote_address)
@@ -72,18 +106,24 @@ def _cleanup_sessions():
     ]
     for sid in expired:
         s = sessions[sid]
+        s.stop_event.set()
         if s.poll_task and not s.poll_task.done():
             s.poll_task.cancel()
         del sessions[sid]
 
 
+async def _cleanup_loop():
+    """Süresi dolan session'ları periyodik olarak temizle (istek yolunda tarama yapılmaz)."""
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL)
+        _cleanup_sessions()
+
+
 def get_session(session_id: str) -> SessionState:
     """Session ID'ye göre state al veya oluştur."""
     if session_id not in sessions:
         if len(sessions) >= MAX_SESSIONS:
-            _cleanup_sessions()
-            if len(sessions) >= MAX_SESSIONS:
-                raise HTTPException(503, "Maksimum oturum sayısına ulaşıldı")
+            raise HTTPException(503, "Maksimum oturum sayısına ulaşıldı")
         sessions[session_id] = SessionState()
     s = sessions[session_id]
     s.last_active = time.time()
@@ -97,7 +137,7 @@ def get_session_id(request: Request) -> str:
         sid = request.query_params.get("session_id", "")
     if not sid:
         raise HTTPException(400, "X-Session-ID header gerekli")
-    if not UUID_RE.match(sid):
+    if not _is_uuid4(sid):
         raise HTTPException(400, "Geçersiz session ID formatı")
     return sid
 
@@ -106,11 +146,22 @@ def get_session_id(request: Request) -> str:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Poll hata logları kuyruğa yazılır; stderr I/O'sunu listener thread'i yapar (event loop bloklanmaz)
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    poll_logger.addHandler(queue_handler)
+    log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stderr))
+    log_listener.start()
+    cleanup_task = asyncio.create_task(_cleanup_loop())
     yield
+    cleanup_task.cancel()
     # Shutdown: cancel all running engines
     for sid, s in sessions.items():
         if s.engine and s.engine.is_running:
             s.engine.cancel()
+    _obs_executor.shutdown(wait=False, cancel_futures=True)
+    poll_logger.removeHandler(queue_handler)
+    log_listener.stop()
 
 _is_production = os.getenv("ENV", "").lower() == "production"
 
@@ -163,19 +214,43 @@ app.add_middleware(SecurityHeadersMiddleware)
 
 # ── WebSocket broadcast (session bazlı) ──
 
-async def broadcast(session_id: str, event: dict):
+BROADCAST_BATCH = 50  # tek gather'da gönderilecek en fazla client
+_PONG = _ws_dumps({"type": "pong"})
+
+
+def _event_json(event: Event) -> str:
+    """Engine Event'ini WS frame'ine çevir. _asdict() (zip + dict) ve pydantic
+    WSEvent katmanı yerine sabit anahtarlı dict literal → tek orjson.dumps."""
+    return _ws_dumps({"type": event.type, "data": event.data, "timestamp": event.timestamp})
+
+
+async def broadcast(session_id: str, msg: str):
+    """Önceden serileştirilmiş payload'ı session'ın tüm client'larına gönder."""
     session = sessions.get(session_id)
     if not session:
         return
-    msg = json.dumps(event, ensure_ascii=False)
+    # Değişmez anlık görüntü: gather sırasında websocket_endpoint set'e ekleyip çıkarabilir
+    clients = tuple(session.ws_clients)
+    if not clients:
+        return
+    # Payload çağıranda bir kez serileştirilir, tüm client'lara aynı nesne gider.
+    # Frontend JSON.parse(evt.data) kullandığı için frame'ler text kalır (ASGI text = str).
+    if len(clients) <= BROADCAST_BATCH:
+        # Tipik durum (1-2 sekme): tek gather, dilimleme/biriktirici yok
+        results = await asyncio.gather(*(ws.send_text(msg) for ws in clients), return_exceptions=True)
+        session.ws_clients.difference_update(
+            [ws for ws, r in zip(clients, results) if isinstance(r, Exception)]
+        )
+        return
     disconnected = []
-    for ws in session.ws_clients:
-        try:
-            await ws.send_text(msg)
-        except Exception:
-            disconnected.append(ws)
-    for ws in disconnected:
-        session.ws_clients.remove(ws)
+    # Client'lara eşzamanlı gönder; yavaş bir client diğerlerini bekletmez
+    for i in range(0, len(clients), BROADCAST_BATCH):
+        batch = clients[i:i + BROADCAST_BATCH]
+        results = await asyncio.gather(*(ws.send_text(msg) for ws in batch), return_exceptions=True)
+        disconnected.extend(ws for ws, r in zip(batch, results) if isinstance(r, Exception))
+        if i + BROADCAST_BATCH < len(clients):
+            await asyncio.sleep(0)  # büyük yayınlarda loop'u diğer isteklere bırak
+    session.ws_clients.difference_update(disconnected)
 
 
 async def poll_engine_events(session_id: str):
@@ -184,39 +259,41 @@ async def poll_engine_events(session_id: str):
     if not session or not session.engine:
         return
 
+    # Session ve engine poll task'ı boyunca sabit — döngüde yeniden aranmaz
     engine = session.engine
     thread = session.engine_thread
+    stop = session.stop_event
 
-    # Engine thread'in başlamasını bekle (race condition önleme)
-    # Thread henüz is_running=True yapmamış olabilir
-    for _ in range(100):  # max 10s
-        if engine.is_running or not engine._events.empty():
-            break
-        if thread and not thread.is_alive():
-            break  # Thread zaten bitti (hata?)
-        await asyncio.sleep(0.1)
-
-    # Event loop: thread alive VEYA events var oldukça devam
-    while True:
-        session = sessions.get(session_id)
-        if not session or not session.engine:
-            break
-
-        events = engine.get_events()
-        for event in events:
-            await broadcast(session_id, event)
+    # Engine thread'i event ürettiğinde loop'u uyandıran zil (sabit poll yok)
+    loop = asyncio.get_running_loop()
+    doorbell = asyncio.Event()
+    engine.set_notifier(lambda: loop.call_soon_threadsafe(doorbell.set))
 
-        # Çıkış: engine durdu VE kuyruk boş VE thread bitti
-        if not engine.is_running and engine._events.empty():
-            if not thread or not thread.is_alive():
-                break
-
-        await asyncio.sleep(0.1)
+    try:
+        # Event loop: thread alive VEYA events var oldukça devam (reset/cleanup durdurur)
+        while not stop.is_set():
+            events = engine.get_events()
+            for event in events:
+                await broadcast(session_id, _event_json(event))
+
+            # Çıkış: engine durdu VE kuyruk boş VE thread bitti
+            if not engine.is_running and engine._events.empty():
+                if not thread or not thread.is_alive():
+                    break
+
+            # Yeni event'i bekle; zaman aşımı yalnızca thread'in event'siz ölmesini yakalamak için
+            try:
+                await asyncio.wait_for(doorbell.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            doorbell.clear()
+    finally:
+        engine.set_notifier(None)
 
     # Son kalan eventleri gönder
     remaining = engine.get_events()
     for event in remaining:
-        await broadcast(session_id, event)
+        await broadcast(session_id, _event_json(event))
 
 
 def _poll_task_done(task: asyncio.Task):
@@ -225,15 +302,18 @@ def _poll_task_done(task: asyncio.Task):
         return
     exc = task.exception()
     if exc:
-        import traceback
-        traceback.print_exception(type(exc), exc, exc.__traceback__)
+        poll_logger.error("Poll task hatası", exc_info=exc)
 
 
 # ── REST Endpoints ──
 
-@app.get("/api/health")
+# Dönüş tipi verilen endpoint'lerde FastAPI çıktıyı Pydantic ile doğrudan JSON bytes'a çevirir
+# (ayrı orjson response sınıfına gerek kalmaz)
+
+@app.get("/api/health", response_class=Response)
 async def health():
-    return {"status": "ok", "time": time.time()}
+    # Load balancer sık yokluyor: model/JSON encoder katmanı yok, gövde elle kurulur
+    return Response(b'{"status":"ok","time":%r}' % time.time(), media_type="application/json")
 
 
 @app.post("/api/config", response_model=ConfigResponse)
@@ -250,6 +330,7 @@ async def set_config(req: ConfigRequest, request: Request):
     session.max_deneme = req.max_deneme
     session.retry_aralik = req.retry_aralik
     session.dry_run = req.dry_run
+    session.paralel_baglanti = req.paralel_baglanti
     return _config_response(session)
 
 
@@ -261,7 +342,8 @@ async def get_config(request: Request):
 
 
 def _config_response(session: SessionState) -> ConfigResponse:
-    return ConfigResponse(
+    # Session alanları ConfigRequest ile zaten doğrulandı — yeniden validasyona gerek yok
+    return ConfigResponse.model_construct(
         ecrn_list=session.ecrn_list,
         scrn_list=session.scrn_list,
         kayit_saati=session.kayit_saati,
@@ -270,6 +352,19 @@ def _config_response(session: SessionState) -> ConfigResponse:
         token_set=bool(session.token),
         token_preview="",
         dry_run=session.dry_run,
+        paralel_baglanti=session.paralel_baglanti,
+    )
+
+
+def _cal_to_result(c: CalibrationData, source: str = "manual") -> CalibrationResult:
+    return CalibrationResult.model_construct(
+        server_offset_ms=c.server_offset * 1000,
+        rtt_one_way_ms=c.rtt_one_way * 1000,
+        rtt_full_ms=c.rtt_one_way * 2000,
+        ntp_offset_ms=c.ntp_offset * 1000,
+        server_ntp_diff_ms=(c.server_offset - c.ntp_offset) * 1000,
+        accuracy_ms=c.rtt_one_way * 1000,
+        source=source,
     )
 
 
@@ -281,11 +376,7 @@ async def test_token(request: Request):
 
     if not session.token:
         raise HTTPException(400, "Token ayarlanmamış")
-    engine = RegistrationEngine(
-        token=session.token,
-        ecrn_list=["00000"],
-    )
-    result = await asyncio.to_thread(engine.test_token)
+    result = await asyncio.to_thread(test_token_light, session.token)
     return TokenTestResult(**result)
 
 
@@ -297,20 +388,8 @@ async def calibrate(request: Request):
 
     if not session.token:
         raise HTTPException(400, "Token ayarlanmamış")
-    engine = RegistrationEngine(
-        token=session.token,
-        ecrn_list=session.ecrn_list or ["00000"],
-    )
-    cal = await asyncio.to_thread(engine.calibrate)
-    return CalibrationResult(
-        server_offset_ms=cal.server_offset * 1000,
-        rtt_one_way_ms=cal.rtt_one_way * 1000,
-        rtt_full_ms=cal.rtt_one_way * 2000,
-        ntp_offset_ms=cal.ntp_offset * 1000,
-        server_ntp_diff_ms=(cal.server_offset - cal.ntp_offset) * 1000,
-        accuracy_ms=cal.rtt_one_way * 1000,
-        source="manual",
-    )
+    cal = await asyncio.to_thread(calibrate_light, session.token, session.ecrn_list or ["00000"])
+    return _cal_to_result(cal)
 
 
 @app.post("/api/register/start")
@@ -344,6 +423,7 @@ async def start_registration(request: Request):
         max_deneme=session.max_deneme,
         retry_aralik=session.retry_aralik,
         dry_run=session.dry_run,
+        paralel_baglanti=session.paralel_baglanti,
     )
 
     # Engine'i ayrı thread'de başlat
@@ -353,6 +433,7 @@ async def start_registration(request: Request):
     # Eski poll_task varsa iptal et (duplicate event yayını önlenir)
     if session.poll_task and not session.poll_task.done():
         session.poll_task.cancel()
+    session.stop_event.clear()
 
     # Event polling'i background task olarak başlat
     session.poll_task = asyncio.create_task(poll_engine_events(session_id))
@@ -386,6 +467,7 @@ async def reset_registration(request: Request):
         session.engine._running = False
         session.engine = None
     session.engine_thread = None
+    session.stop_event.set()
     if session.poll_task and not session.poll_task.done():
         session.poll_task.cancel()
     session.poll_task = None
@@ -393,52 +475,97 @@ async def reset_registration(request: Request):
 
 
 @app.get("/api/register/status", response_model=RegistrationState)
-async def registration_status(request: Request):
+async def registration_status(request: Request, response: Response):
+    """Başlangıç yüklemesi için tam durum; canlı güncellemeler WS üzerinden (state/crn_update/calibration).
+    ETag: engine.state_version + deneme + running → değişiklik yoksa 304.
+    Tetik zamanı belliyken countdown_seconds her istekte değişir → ETag yok, no-store
+    (304 ile eski geri sayım yeniden kullanılmasın; frontend WS açılışında bu alanı okur)."""
     session_id = get_session_id(request)
     session = get_session(session_id)
+    engine = session.engine
 
-    if not session.engine:
+    if engine and engine.trigger_time:
+        response.headers["Cache-Control"] = "no-store"
+    else:
+        if not engine:
+            etag = 'W/"idle"'
+        else:
+            etag = (
+                f'W/"{id(engine):x}.{engine.state_version}.{engine.current_attempt}'
+                f'.{int(engine.is_running)}.{session.max_deneme}"'
+            )
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    if not engine:
         return RegistrationState()
 
-    crn_results = []
-    for crn, info in session.engine.crn_results.items():
-        try:
-            status = CRNStatus(info["status"])
-        except ValueError:
-            status = CRNStatus.PENDING
-        crn_results.append(CRNResultItem(crn=crn, status=status, message=info.get("message", "")))
+    # Bilinmeyen status → pending (adapter'dan önce, sütun üzerinde eşlenir; doğrulama hatası olmaz)
+    table = engine.crn_results_snapshot
+    statuses = [s if s in CRN_STATUS_VALUES else "pending" for s in table.statuses]
+    crn_results = CRN_RESULTS_ADAPTER.validate_python([
+        {"crn": crn, "status": status, "message": message}
+        for crn, status, message in zip(table.crns, statuses, table.messages)
+    ])
 
     cal = None
-    if session.engine.calibration:
-        c = session.engine.calibration
-        cal = CalibrationResult(
-            server_offset_ms=c.server_offset * 1000,
-            rtt_one_way_ms=c.rtt_one_way * 1000,
-            rtt_full_ms=c.rtt_one_way * 2000,
-            ntp_offset_ms=c.ntp_offset * 1000,
-            server_ntp_diff_ms=(c.server_offset - c.ntp_offset) * 1000,
-            accuracy_ms=c.rtt_one_way * 1000,
-        )
+    c = engine.calibration
+    if c:
+        # CalibrationData yerinde değişmez; yeniden kalibrasyonda yeni nesne atanır
+        cached = session.cal_cache
+        if cached is not None and cached[0] is c:
+            cal = cached[1]
+        else:
+            cal = _cal_to_result(c)
+            session.cal_cache = (c, cal)
 
     remaining = None
-    if session.engine.trigger_time:
-        remaining = max(0, session.engine.trigger_time - time.time())
-
-    return RegistrationState(
-        phase=session.engine.phase,
-        running=session.engine.is_running,
-        current_attempt=session.engine.current_attempt,
+    if engine.trigger_time:
+        remaining = max(0, engine.trigger_time - time.time())
+
+    # Engine'in kendi state'i — güvenilir iç veri, model_construct ile validasyonu atla
+    return RegistrationState.model_construct(
+        phase=engine.phase,
+        running=engine.is_running,
+        current_attempt=engine.current_attempt,
         max_attempts=session.max_deneme,
         crn_results=crn_results,
         calibration=cal,
         countdown_seconds=remaining,
-        trigger_time=session.engine.trigger_time,
+        trigger_time=engine.trigger_time,
     )
 
 
 # ── OBS Ders Programı Proxy (session-agnostic) ──
 
+# OBS proxy çağrıları kendi havuzunda: yavaş OBS yanıtları test_token/calibrate
+# (asyncio.to_thread) için varsayılan havuzu tüketmez.
+_obs_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="obs")
+
+
+async def _run_obs(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_obs_executor, fn, *args)
+
+
+# CRN → (CourseInfo, dict). Servis cache'i yenilediğinde yeni CourseInfo nesnesi gelir;
+# kimlik (is) kontrolü eski girdiyi kendiliğinden geçersiz kılar.
+_course_dict_cache: dict[str, tuple[OBSCourseInfo, dict]] = {}
+_COURSE_DICT_CACHE_MAX = 8192
+
+
 def _course_to_dict(c: OBSCourseInfo) -> dict:
+    hit = _course_dict_cache.get(c.crn)
+    if hit is not None and hit[0] is c:
+        return hit[1]
+    d = _build_course_dict(c)
+    if len(_course_dict_cache) >= _COURSE_DICT_CACHE_MAX:
+        _course_dict_cache.clear()
+    _course_dict_cache[c.crn] = (c, d)
+    return d
+
+
+def _build_course_dict(c: OBSCourseInfo) -> dict:
     return {
         "crn": c.crn,
         "course_code": c.course_code,
@@ -461,35 +588,55 @@ def _course_to_dict(c: OBSCourseInfo) -> dict:
     }
 
 
-@app.get("/api/departments")
+# Bölüm listesi nadiren değişir: encode edilmiş gövde servis TTL'i boyunca saklanır.
+# (ts, servisin döndürdüğü liste, JSON bytes) — isabette ne thread hop ne encode.
+_dept_cache: Optional[tuple[float, list, bytes]] = None
+
+
+@app.get("/api/departments", response_class=Response)
 async def get_departments():
+    global _dept_cache
     service = get_obs_service()
-    return await asyncio.to_thread(service.get_departments)
+    now = time.time()
+    cached = _dept_cache
+    if cached is not None and now - cached[0] < service.cache_ttl:
+        return Response(cached[2], media_type="application/json")
+    data = await _run_obs(service.get_departments)
+    if cached is not None and cached[1] is data:
+        body = cached[2]  # servis aynı listeyi döndürdü (kendi cache'i / hata fallback'i)
+    else:
+        body = _json_bytes(data)
+    if data:  # boş liste = OBS hatası, cache'leme
+        _dept_cache = (now, data, body)
+    return Response(body, media_type="application/json")
 
 
 @app.get("/api/courses/{brans_kodu_id}")
-async def get_courses(brans_kodu_id: int):
+async def get_courses(brans_kodu_id: int) -> list[dict]:
     service = get_obs_service()
-    courses = await asyncio.to_thread(service.get_courses, brans_kodu_id)
+    courses = await _run_obs(service.get_courses, brans_kodu_id)
     return [_course_to_dict(c) for c in courses]
 
 
 @app.get("/api/crn-lookup/{crn}")
-async def lookup_crn(crn: str):
+async def lookup_crn(crn: str) -> dict:
     service = get_obs_service()
-    result = await asyncio.to_thread(service.lookup_crn, crn)
+    result = await _run_obs(service.lookup_crn, crn)
     if result is None:
         raise HTTPException(404, f"CRN {crn} bulunamadı")
     return _course_to_dict(result)
 
 
 @app.post("/api/crn-lookup")
-async def lookup_crns_batch(body: dict):
+async def lookup_crns_batch(body: dict) -> dict[str, Optional[dict]]:
     crns = body.get("crns", [])
     if not crns:
         raise HTTPException(400, "CRN listesi boş")
     service = get_obs_service()
-    results = await asyncio.to_thread(service.lookup_crns, crns)
+    # lookup_crns zaten bölüm bazında toplu arar (her bölüm bir kez çekilir, tüm CRN'ler birlikte
+    # kontrol edilir) → CRN başına paralel lookup_crn aynı bölümleri tekrar tekrar çekerdi.
+    # Yalnızca tekrarlanan CRN'leri ayıkla.
+    results = await _run_obs(service.lookup_crns, list(dict.fromkeys(crns)))
     return {crn: _course_to_dict(info) if info else None for crn, info in results.items()}
 
 
@@ -498,28 +645,31 @@ async def lookup_crns_batch(body: dict):
 @app.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket, session_id: str = Query(...)):
     # UUID format doğrulaması (REST API ile aynı güvenlik seviyesi)
-    if not UUID_RE.match(session_id):
+    if not _is_uuid4(session_id):
         await ws.close(code=4000, reason="Geçersiz session ID formatı")
         return
     await ws.accept()
     session = get_session(session_id)
-    session.ws_clients.append(ws)
+    session.ws_clients.add(ws)
     try:
         while True:
             # Ping/pong veya client mesajlarını oku
             data = await ws.receive_text()
             if data == "ping":
-                await ws.send_text(json.dumps({"type": "pong"}))
+                await ws.send_text(_PONG)
     except WebSocketDisconnect:
         pass
     finally:
         session = sessions.get(session_id)
-        if session and ws in session.ws_clients:
-            session.ws_clients.remove(ws)
+        if session:
+            session.ws_clients.discard(ws)
 
 
 # ── Run ──
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # uvloop Windows'ta yok — orada varsayılan asyncio loop'a düş
+    loop = "uvloop" if sys.platform != "win32" else "asyncio"
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info",
+                loop=loop, http="httptools", ws="websockets")
@@ -1,10 +1,9 @@
-import re
-
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter
+from typing import Annotated, Optional
 from enum import Enum
 
-CRN_RE = re.compile(r'^\d{5}$')
+# 5 haneli CRN — pattern Python re yerine pydantic-core (Rust) içinde doğrulanır
+CRN = Annotated[str, StringConstraints(pattern=r'^\d{5}$')]
 
 
 class CRNStatus(str, Enum):
@@ -20,24 +19,21 @@ class CRNStatus(str, Enum):
 
 
 class ConfigRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     token: Optional[str] = Field(default=None, description="JWT Bearer token (gönderilmezse mevcut token korunur)")
-    ecrn_list: list[str] = Field(..., description="Eklenecek CRN listesi", max_length=20)
-    scrn_list: list[str] = Field(default_factory=list, description="Silinecek CRN listesi", max_length=20)
+    ecrn_list: list[CRN] = Field(..., description="Eklenecek CRN listesi", max_length=20)
+    scrn_list: list[CRN] = Field(default_factory=list, description="Silinecek CRN listesi", max_length=20)
     kayit_saati: str = Field(default="", pattern=r"^(\d{2}:\d{2}:\d{2})?$")
     max_deneme: int = Field(default=60, ge=1, le=300)
     retry_aralik: float = Field(default=3.0, ge=3.0, le=10.0)
     dry_run: bool = Field(default=False, description="Test modu — gerçek kayıt yapmaz")
-
-    @field_validator('ecrn_list', 'scrn_list')
-    @classmethod
-    def validate_crn_format(cls, v: list[str]) -> list[str]:
-        for crn in v:
-            if not CRN_RE.match(crn):
-                raise ValueError(f"Geçersiz CRN formatı: '{crn}' (5 haneli sayı olmalı)")
-        return v
+    paralel_baglanti: int = Field(default=1, ge=1, le=4, description="CRN'lerin paylaştırılacağı eşzamanlı bağlantı sayısı")
 
 
 class ConfigResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     ecrn_list: list[str]
     scrn_list: list[str]
     kayit_saati: str
@@ -46,6 +42,7 @@ class ConfigResponse(BaseModel):
     token_set: bool
     token_preview: str = ""
     dry_run: bool = False
+    paralel_baglanti: int = 1
 
 
 class CalibrationResult(BaseModel):
@@ -64,12 +61,17 @@ class CRNResultItem(BaseModel):
     message: str = ""
 
 
+# /status'taki CRN listesi tek Rust çağrısıyla doğrulanır (öğe başına model kurulumu yok)
+CRN_RESULTS_ADAPTER = TypeAdapter(list[CRNResultItem])
+CRN_STATUS_VALUES = frozenset(s.value for s in CRNStatus)
+
+
 class RegistrationState(BaseModel):
     phase: str = "idle"  # idle, calibrating, waiting, registering, done
     running: bool = False
     current_attempt: int = 0
     max_attempts: int = 60
-    crn_results: list[CRNResultItem] = []
+    crn_results: list[CRNResultItem] = Field(default_factory=list)
     calibration: Optional[CalibrationResult] = None
     countdown_seconds: Optional[float] = None
     trigger_time: Optional[float] = None
@@ -83,5 +85,5 @@ class TokenTestResult(BaseModel):
 
 class WSEvent(BaseModel):
     type: str  # log, state, crn_update, calibration, countdown, done
-    data: dict = {}
+    data: dict = Field(default_factory=dict)
     timestamp: float = 0.0
@@ -10,6 +10,7 @@ ve in-memory LRU cache ile hızlı CRN lookup sağlar.
 - Popüler bölümler öncelikli arama
 """
 
+import json
 import re
 import time
 import logging
@@ -20,6 +21,12 @@ from collections import OrderedDict
 import requests
 from bs4 import BeautifulSoup
 
+try:
+    import orjson
+    _json_loads = orjson.loads  # bytes'ı doğrudan parse eder (ara str yok)
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 OBS_BASE = "https://obs.itu.edu.tr"
@@ -108,7 +115,7 @@ class OBSCourseService:
                 timeout=10,
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = _json_loads(resp.content)
             self._departments = data
             self._departments_ts = now
             logger.info(f"Fetched {len(data)} departments from OBS")
@@ -141,8 +148,7 @@ class OBSCourseService:
                 timeout=15,
             )
             resp.raise_for_status()
-            resp.encoding = "utf-8"
-            courses = self._parse_courses_html(resp.text)
+            courses = self._parse_courses_html(resp.content.decode("utf-8", "replace"))
         except Exception as e:
             logger.error(f"Course fetch failed for dept {brans_kodu_id}: {e}")
             # Return stale cache if available
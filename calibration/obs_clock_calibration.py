@@ -13,61 +13,128 @@ Yöntem:
 Hedef: ±15ms hassasiyet
 """
 
+import contextlib
+import math
 import time
-import statistics
+import random
 import socket
+import ssl
 import struct
 import requests
+import requests.adapters
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 
 OBS_URL = "https://obs.itu.edu.tr"
+PROBE_WINDOW = 0.05  # tahmin edilen saniye sınırı çevresinde yoklama penceresi (±sn)
+MAX_PREDICTION_MISSES = 2  # art arda bu kadar ıskalamada tam taramaya dön
+PROBE_STREAMS = 3  # tahmin penceresinde eşzamanlı, RTT/3 kaydırılmış HEAD akışı
+CALIBRATION_WORKERS = 4  # eşzamanlı örnekleyici thread (her biri kendi keep-alive oturumuyla)
+WAKE_MARGIN = 0.03  # sınır tahminliyken yoklama başlangıcından bu kadar önce uyan (sn)
 
 # ── NTP ──────────────────────────────────────────────
 
+NTP_EPOCH = 2208988800  # 1900 → 1970
+NTP_SERVERS = ("time.google.com", "time.windows.com", "pool.ntp.org")
+NTP_REQUEST = struct.Struct('!I36xQ')  # 48 bayt: başlık + boş alanlar + transmit (nonce)
+# Yanıttan yalnızca gereken alanlar: başlık, originate, receive, transmit (64-bit sabit nokta)
+NTP_REPLY = struct.Struct('!I20xQQQ')
+
+
+def _ntp_request(nonce):
+    """İstemci paketi (LI=0, VN=3, mode=3). Transmit alanına 64-bit nonce yazılır;
+    sunucu bunu originate alanına kopyalar → yanıt hangi isteğe ait anlaşılır.
+    (t1 yerelde tutulur; kaba saatli sistemlerde de anahtarlar çakışmaz.)"""
+    return NTP_REQUEST.pack(0x1b << 24, nonce)
+
+
+def _ntp_parse(f, t1, t4):
+    """Tek unpack ile çözülmüş yanıt alanları → (offset, delay) veya None (KoD)."""
+    if (f[0] >> 16) & 0xFF == 0:  # stratum 0 = Kiss-o'-Death
+        return None
+    # 32.32 sabit nokta tek bölmeyle saniyeye (float 53 bit → ~0.2µs çözünürlük)
+    t2 = f[2] / 2**32 - NTP_EPOCH
+    t3 = f[3] / 2**32 - NTP_EPOCH
+    offset = ((t2 - t1) + (t3 - t4)) / 2
+    delay = (t4 - t1) - (t3 - t2)
+    return offset, delay
+
+
 def ntp_offset(server="time.google.com", timeout=2):
     """NTP sunucusundan offset (saniye) ve delay ölç."""
-    NTP_EPOCH = 2208988800  # 1900 → 1970
-
     client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     client.settimeout(timeout)
 
-    # NTP paketi oluştur
-    data = b'\x1b' + 47 * b'\0'
+    nonce = random.getrandbits(64)
     t1 = time.time()
-
     try:
-        client.sendto(data, (server, 123))
+        client.sendto(_ntp_request(nonce), (server, 123))
         data, _ = client.recvfrom(1024)
     finally:
         client.close()
-
     t4 = time.time()
 
-    # NTP yanıtından sunucu zamanlarını çıkar
-    t2 = struct.unpack('!12I', data)[8] + struct.unpack('!12I', data)[9] / (2**32) - NTP_EPOCH
-    t3 = struct.unpack('!12I', data)[10] + struct.unpack('!12I', data)[11] / (2**32) - NTP_EPOCH
-
-    offset = ((t2 - t1) + (t3 - t4)) / 2
-    delay = (t4 - t1) - (t3 - t2)
+    f = NTP_REPLY.unpack_from(data) if len(data) >= 48 else None
+    result = _ntp_parse(f, t1, t4) if f and f[1] == nonce else None
+    if result is None:
+        raise Exception(f"Geçersiz NTP yanıtı: {server}")
+    return result
 
-    return offset, delay
 
+def get_ntp_time(samples_per_server=3, timeout=2):
+    """En iyi NTP ölçümünü al (sunucu başına 3 deneme, en düşük delay).
 
-def get_ntp_time():
-    """En iyi NTP ölçümünü al (3 deneme, en düşük delay)."""
+    Tek UDP soketi: tüm istekler önce gönderilir, yanıtlar originate
+    zaman damgasıyla eşleştirilerek toplanır → RTT'ler sıralı değil üst üste biner."""
     best_offset = None
     best_delay = float('inf')
 
-    for server in ["time.google.com", "time.windows.com", "pool.ntp.org"]:
-        try:
-            for _ in range(3):
-                offset, delay = ntp_offset(server)
-                if delay < best_delay:
-                    best_delay = delay
-                    best_offset = offset
-        except Exception:
-            continue
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        pending = {}  # nonce → t1
+        for server in NTP_SERVERS:
+            try:
+                addr = socket.getaddrinfo(server, 123, socket.AF_INET, socket.SOCK_DGRAM)[0][4]
+            except OSError:
+                continue
+            for _ in range(samples_per_server):
+                nonce = random.getrandbits(64)
+                packet = _ntp_request(nonce)
+                t1 = time.time()
+                try:
+                    client.sendto(packet, addr)
+                except OSError:
+                    continue
+                pending[nonce] = t1
+
+        deadline = time.time() + timeout
+        while pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            client.settimeout(remaining)
+            try:
+                data, _ = client.recvfrom(1024)
+            except socket.timeout:
+                break
+            except OSError:
+                continue
+            t4 = time.time()
+            if len(data) < 48:
+                continue
+            f = NTP_REPLY.unpack_from(data)
+            t1 = pending.pop(f[1], None)
+            if t1 is None:
+                continue  # bize ait olmayan / geç gelen yanıt
+            result = _ntp_parse(f, t1, t4)
+            if result is not None and result[1] < best_delay:
+                best_offset, best_delay = result[0], result[1]
+    finally:
+        client.close()
 
     if best_offset is None:
         raise Exception("NTP sunucularına ulaşılamadı!")
@@ -75,59 +142,419 @@ def get_ntp_time():
     return best_offset, best_delay
 
 
+# ── HTTP Oturumu ────────────────────────────────────
+
+# Tüm kalibrasyon bağlantıları için tek TLS bağlamı — CA paketi bir kez yüklenir,
+# yeni bağlantı (ilk burst, kopma, yeni işçi) el sıkışmaya yalnızca ağ maliyetiyle girer.
+# Minimum sürüm zorlanmaz: sunucu 1.2'de kalırsa kalibrasyon yine çalışmalı.
+_TLS_CTX = ssl.create_default_context(cafile=requests.certs.where())
+_TLS_CTX.options |= getattr(ssl, "OP_ENABLE_KTLS", 0)
+
+
+class _TLSAdapter(requests.adapters.HTTPAdapter):
+    """Havuzu ortak _TLS_CTX ile kuran adapter (requests sürümüne göre bağlantı başına context üretilmez)."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = _TLS_CTX
+        super().init_poolmanager(*args, **kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        if verify is True:
+            pool_kwargs["ssl_context"] = _TLS_CTX
+        return host_params, pool_kwargs
+
+
+def create_session(pool_maxsize=32):
+    """Keep-alive oturumu: tüm HEAD'ler aynı havuzdaki sıcak TCP+TLS bağlantısını kullanır."""
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+        "Connection": "keep-alive",
+    })
+    adapter = _TLSAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    return session
+
+
+def pin_dns(url=OBS_URL):
+    """URL'nin host'unu bir kez çöz, socket.getaddrinfo'yu o host:port için sabitle.
+
+    Havuz yeni bağlantı açtığında (ilk burst, timeout, yeni işçi) DNS gecikmesi
+    ölçüme karışmaz. Kısa ömürlü script — süreç genelinde yama yeterli.
+    Host/SNI adı değişmez; yalnızca çözümleme önbellekten gelir.
+    Döndürür: sabitlenen IP (çözülemezse None)."""
+    parts = urlsplit(url)
+    host = parts.hostname
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        pinned = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_STREAM)
+    except OSError:
+        return None
+
+    real_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(h, p, *args, **kwargs):
+        if h == host and p == port:
+            return pinned
+        return real_getaddrinfo(h, p, *args, **kwargs)
+
+    socket.getaddrinfo = getaddrinfo
+    return pinned[0][4][0]
+
+
 # ── Date Header Geçiş Yakalama ──────────────────────
 
-def detect_date_transition(session, ntp_off):
+def _server_second(date_hdr):
+    """RFC 1123 Date header → sunucunun epoch saniyesi (None: boş/bozuk)."""
+    if not date_hdr:
+        return None
+    try:
+        return int(parsedate_to_datetime(date_hdr).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def _obs_offset_ms(transition_local, ntp_off):
+    """Yerel geçiş anı → OBS saati - NTP saati (ms)."""
+    # NTP düzeltmesi uygula
+    transition_ntp = transition_local + ntp_off
+
+    # Bu an tam saniye sınırı olmalı (.000)
+    # OBS saatindeki saniye sınırı ile gerçek saniye sınırı farkı
+    fractional = transition_ntp % 1.0  # 0.000 - 0.999 arası
+    if fractional > 0.5:
+        return (fractional - 1.0) * 1000  # Negatif = OBS geri
+    return fractional * 1000  # Pozitif = OBS ileri
+
+
+def _date_prober(session):
+    """Ölçüm döngüsü için HEAD → Date okuyucu. İstek bir kez hazırlanır ve doğrudan
+    adapter'a gönderilir: Session.request'in her çağrıdaki hazırlık/ortam/cookie/hook
+    katmanı zamanlanan bölgenin dışında kalır (daha az Python işi, thread'ler arası
+    daha kısa GIL beklemesi → RTT/orta nokta gürültüsü düşer)."""
+    prepared = session.prepare_request(requests.Request("HEAD", OBS_URL))
+    send = session.get_adapter(OBS_URL).send
+
+    def head_date():
+        return send(prepared, timeout=2).headers.get("Date")
+    return head_date
+
+
+def _probe_streams(session, start_ns, deadline_ns, stagger_ns):
+    """PROBE_STREAMS eşzamanlı HEAD akışı, başlangıçları stagger_ns kaydırılmış.
+
+    Her akış kendi keep-alive bağlantısında sıralı yoklar; birleşik dizide
+    ardışık örnekler RTT yerine ~RTT/PROBE_STREAMS aralıklı olur.
+    Akış, yeni saniyeyi gördüğü anda durur (sınır geçildi, devamı boşa istek).
+    Döndürür: sunucuya varış (orta nokta) sırasına göre [(mid_ns, rtt_ns, sec)]."""
+    samples = []  # list.append thread-safe
+
+    def stream(k):
+        head_date = _date_prober(session)
+        delay = (start_ns + k * stagger_ns - time.monotonic_ns()) * 1e-9
+        if delay > 0:
+            time.sleep(delay)
+        first_sec = None
+        while time.monotonic_ns() < deadline_ns:
+            t_before = time.monotonic_ns()
+            try:
+                date_hdr = head_date()
+            except Exception:
+                continue
+            t_after = time.monotonic_ns()
+            sec = _server_second(date_hdr)
+            samples.append(((t_before + t_after) // 2, t_after - t_before, sec))
+            if sec is not None:
+                if first_sec is None:
+                    first_sec = sec
+                elif sec != first_sec:
+                    break
+
+    threads = [threading.Thread(target=stream, args=(k,), daemon=True) for k in range(PROBE_STREAMS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    samples.sort()
+    return samples
+
+
+def detect_date_transition(session, ntp_off, predicted_boundary=None):
     """
     OBS'ye hızlı istekler atarak Date header'ın
     saniye değişim anını yakala.
 
-    Döndürür: obs_offset_ms (OBS saati - NTP saati, ms cinsinden)
+    predicted_boundary: önceki geçişin yerel zamanı. Verilirse sonraki
+    saniye sınırına kadar uyunur ve yalnızca ±PROBE_WINDOW içinde,
+    kaydırılmış eşzamanlı akışlarla yoklanır (~30 yerine birkaç istek).
+    Verilmezse 3 saniyelik sıralı tarama.
+
+    Döndürür: (obs_offset_ms, rtt_ms, request_count, transition_local)
+    obs_offset_ms = OBS saati - NTP saati (ms cinsinden)
     """
-    prev_date = None
-    transition_time = None
+    prev_sec = None
+    request_count = 0
+    head_date = _date_prober(session)
+
+    # Isıtma: bağlantı koptuysa TCP+TLS burada kurulur, ölçülen ilk istek sıcak bağlantıya düşer.
+    # Yanıtın Date'i boşa gitmez — ilk karşılaştırma değeri olur.
+    t_before = time.monotonic_ns()
+    try:
+        prev_sec = _server_second(head_date())
+        request_count += 1
+    except Exception:
+        pass
+    rtt_est = (time.monotonic_ns() - t_before) * 1e-9
+
+    # Döngüde yalnızca monotonic_ns (int, NTP slew'den etkilenmez); duvar saatine
+    # tek bir çapa ile çevrilir → ölçüm sırasında saat ayarlansa da RTT/orta nokta bozulmaz
+    wall0 = time.time()
+    mono0 = time.monotonic_ns()
+
+    if predicted_boundary is not None:
+        # Sunucu saniyesi yerel saatte predicted_boundary + k'da döner.
+        # İlk yoklama sınırdan PROBE_WINDOW + bir RTT önce: o yanıt karşılaştırma tabanı olur.
+        lead = PROBE_WINDOW + rtt_est
+        boundary = predicted_boundary + math.ceil(wall0 + lead - predicted_boundary)
+        start_ns = mono0 + int((boundary - lead - wall0) * 1e9)
+        deadline_ns = mono0 + int((boundary + PROBE_WINDOW + rtt_est - wall0) * 1e9)
+        samples = _probe_streams(session, start_ns, deadline_ns, int(rtt_est * 1e9 / PROBE_STREAMS))
+        request_count += len(samples)
+
+        prev_sec = None
+        for mid, rtt_ns, sec in samples:
+            if sec is None:
+                continue
+            if prev_sec is not None and sec - prev_sec == 1:
+                # Geçiş: yeni saniyeyi gösteren ilk örneğin orta noktası (RTT/2 tahmini)
+                transition_local = wall0 + (mid - mono0) * 1e-9
+                return _obs_offset_ms(transition_local, ntp_off), rtt_ns * 1e-6, request_count, transition_local
+            prev_sec = sec
+        return None, None, request_count, None
 
     # Hızlı istekler at, Date geçişini bekle (max 3 saniye)
-    start = time.time()
-    request_count = 0
+    deadline_ns = mono0 + 3_000_000_000
 
-    while time.time() - start < 3.0:
-        t_before = time.time()
+    while time.monotonic_ns() < deadline_ns:
+        t_before = time.monotonic_ns()
         try:
-            resp = session.head(OBS_URL, timeout=2)
+            date_hdr = head_date()
         except Exception:
             continue
-        t_after = time.time()
+        t_after = time.monotonic_ns()
 
         request_count += 1
-        date_str = resp.headers.get("Date", "")
+        sec = _server_second(date_hdr)
+
+        if sec is None:
+            continue
 
-        if not date_str:
+        if prev_sec is not None and sec - prev_sec > 1:
+            prev_sec = sec  # iki istek arasında birden çok saniye geçti — sınır bu istekte değil
             continue
 
-        if prev_date and date_str != prev_date:
+        if prev_sec is not None and sec != prev_sec:
             # GEÇİŞ YAKALANDI!
             # İsteğin ortasında geçiş oldu
-            rtt = t_after - t_before
+            rtt = (t_after - t_before) * 1e-9
             # Geçiş anı tahmini: istek gönderiminden RTT/2 sonra
-            transition_local = t_before + rtt / 2
+            transition_local = wall0 + (t_before - mono0) * 1e-9 + rtt / 2
+            return _obs_offset_ms(transition_local, ntp_off), rtt * 1000, request_count, transition_local
+
+        prev_sec = sec
+
+    return None, None, request_count, None
+
+
+# ── İstatistik ──────────────────────────────────────
+
+class RunningStats:
+    """Welford: ortalama/varyans tek geçişte, ara liste taraması olmadan güncellenir."""
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, values=()):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        for x in values:
+            self.add(x)
+
+    def add(self, x):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    @property
+    def stdev(self):
+        return (self.m2 / (self.n - 1)) ** 0.5 if self.n > 1 else 0.0
+
+    @property
+    def ci95(self):
+        """Ortalamanın %95 güven aralığı yarı genişliği (1.96·σ/√n)."""
+        return 1.96 * self.stdev / self.n ** 0.5 if self.n > 1 else 999
 
-            # NTP düzeltmesi uygula
-            transition_ntp = transition_local + ntp_off
 
-            # Bu an tam saniye sınırı olmalı (.000)
-            # OBS saatindeki saniye sınırı ile gerçek saniye sınırı farkı
-            fractional = transition_ntp % 1.0  # 0.000 - 0.999 arası
-            if fractional > 0.5:
-                obs_offset_ms = (fractional - 1.0) * 1000  # Negatif = OBS geri
-            else:
-                obs_offset_ms = fractional * 1000  # Pozitif = OBS ileri
 
-            return obs_offset_ms, rtt * 1000, request_count
+class P2Quantile:
+    """P² (Jain & Chlamtac) tek quantile tahmini: 5 işaretçi, O(1) bellek, liste saklanmaz."""
+    __slots__ = ("p", "q", "pos", "want", "dwant")
 
-        prev_date = date_str
+    def __init__(self, p):
+        self.p = p
+        self.q = []  # işaretçi yükseklikleri (ilk 5 örnekte ham değerler)
+        self.pos = [0, 1, 2, 3, 4]
+        self.want = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.dwant = (0, p / 2, p, (1 + p) / 2, 1)
 
-    return None, None, request_count
+    def add(self, x):
+        q = self.q
+        if len(q) < 5:
+            q.append(x)
+            if len(q) == 5:
+                q.sort()
+            return
+
+        pos = self.pos
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        want = self.want
+        for i in range(5):
+            want[i] += self.dwant[i]
+
+        # Orta işaretçileri hedef konumlarına parabolik (olmazsa doğrusal) kaydır
+        for i in (1, 2, 3):
+            d = want[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                s = 1 if d > 0 else -1
+                qp = q[i] + s / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + s) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - s) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + s * (q[i + s] - q[i]) / (pos[i + s] - pos[i])
+                q[i] = qp
+                pos[i] += s
+
+    @property
+    def value(self):
+        q = self.q
+        if len(q) < 5:
+            if not q:
+                return 0.0
+            s = sorted(q)
+            return s[min(len(s) - 1, int(self.p * len(s)))]
+        return q[2]
+
+
+class OffsetSummary:
+    """Offset örneklerinin akan özeti — ham Welford, P² medyan/robust σ ve
+    aynı geçişte ±2σ_robust filtreli temiz Welford. Örnek listesi tutulmaz;
+    yalnızca ilk WARMUP örnek, quantile tahminleri oturana kadar tamponlanır."""
+    WARMUP = 50
+
+    def __init__(self):
+        self.raw = RunningStats()
+        self.clean = RunningStats()
+        self.q16 = P2Quantile(0.16)
+        self.q50 = P2Quantile(0.50)
+        self.q84 = P2Quantile(0.84)
+        self._warmup = []
+
+    @property
+    def median(self):
+        return self.q50.value
+
+    @property
+    def robust_stdev(self):
+        """Normal dağılımda 16.-84. yüzdelik aralığının yarısı ≈ σ (outlier'dan etkilenmez)."""
+        return (self.q84.value - self.q16.value) / 2
+
+    def add(self, x):
+        self.raw.add(x)
+        self.q16.add(x)
+        self.q50.add(x)
+        self.q84.add(x)
+        if self._warmup is not None:
+            self._warmup.append(x)
+            if len(self._warmup) >= self.WARMUP:
+                self._flush()
+        else:
+            self._gate(x)
+
+    def finish(self):
+        """Kısa koşularda tamponda kalanları son tahminlerle filtrele."""
+        if self._warmup is not None:
+            self._flush()
+
+    def _flush(self):
+        pending, self._warmup = self._warmup, None
+        for x in pending:
+            self._gate(x)
+
+    def _gate(self, x):
+        if abs(x - self.q50.value) < 2 * self.robust_stdev:
+            self.clean.add(x)
+
+# ── Paralel Örnekleme ───────────────────────────────
+
+class _Sampler:
+    """Tek geçiş örneği alır; oturum ve sınır tahmini işçi thread'ine özeldir (threading.local)."""
+
+    def __init__(self, ntp_off):
+        self.ntp_off = ntp_off
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def sample(self):
+        st = self._local
+        if not hasattr(st, "session"):
+            st.session = create_session(pool_maxsize=8)
+            st.boundary, st.misses, st.rtt = None, 0, 0.0
+            with self._lock:
+                self._sessions.append(st.session)
+
+        time.sleep(self._sleep_for(st))
+        obs_off, rtt, _, transition_local = detect_date_transition(st.session, self.ntp_off, st.boundary)
+
+        if transition_local is not None:
+            st.boundary, st.misses, st.rtt = transition_local, 0, rtt / 1000
+        elif st.boundary is not None:
+            st.misses += 1
+            if st.misses >= MAX_PREDICTION_MISSES:
+                st.boundary, st.misses = None, 0
+        return obs_off, rtt
+
+    @staticmethod
+    def _sleep_for(st):
+        """Örnekler arası bekleme. Sınır tahmini varsa bir sonraki sınırın yoklama
+        başlangıcına (ısıtma isteği + pencere + WAKE_MARGIN) kadar uyunur — ısıtma
+        isteği böylece yoklamanın hemen önüne düşer, bağlantı ~1sn boşta kalmaz.
+        Tahmin yoksa ya da son örnek ıskaladıysa rastgele kısa bekleme (işçiler aynı anda vurmasın)."""
+        if st.boundary is None or st.misses:
+            return random.uniform(0, 0.1)
+        lead = PROBE_WINDOW + 2 * st.rtt + WAKE_MARGIN
+        now = time.time()
+        wake = st.boundary + math.ceil(now + lead - st.boundary) - lead
+        return max(0.02, wake - now)
+
+    def close(self):
+        with self._lock:
+            for s in self._sessions:
+                s.close()
+            self._sessions.clear()
 
 
 # ── Ana Kalibrasyon ─────────────────────────────────
@@ -152,11 +579,17 @@ def main():
     # 2. OBS bağlantı testi
     print()
     print("2️⃣  OBS bağlantı testi...")
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-    })
+    ip = pin_dns(OBS_URL)
+    if ip:
+        print(f"   DNS sabitlendi: {urlsplit(OBS_URL).hostname} → {ip}")
+    session = create_session()
+    try:
+        _calibrate(session, ntp_off)
+    finally:
+        session.close()
+
 
+def _calibrate(session, ntp_off):
     try:
         resp = session.head(OBS_URL, timeout=5)
         date_hdr = resp.headers.get("Date", "Yok")
@@ -172,69 +605,78 @@ def main():
     target_samples = 5000  # 5000 geçiş ölçümü → ±4ms hassasiyet hedefi
     print()
     print(f"3️⃣  {target_samples} Date header geçişi ölçülüyor...")
-    print(f"   (Her biri ~1-2 saniye, toplam ~{target_samples * 1.5:.0f} saniye)")
+    print(f"   (Her biri ~1-2 saniye, {CALIBRATION_WORKERS} paralel işçi, "
+          f"toplam ~{target_samples * 1.5 / CALIBRATION_WORKERS:.0f} saniye)")
     print()
 
-    offsets = []
-    rtts = []
-
-    for i in range(target_samples):
-        obs_off, rtt, req_count = detect_date_transition(session, ntp_off)
-
-        if obs_off is not None:
-            offsets.append(obs_off)
-            rtts.append(rtt)
-            if len(offsets) % 50 == 0 or len(offsets) <= 5:
-                cur_mean = statistics.mean(offsets)
-                cur_std = statistics.stdev(offsets) if len(offsets) > 1 else 0
-                cur_se = 1.96 * cur_std / (len(offsets) ** 0.5) if len(offsets) > 1 else 999
-                print(f"   [{len(offsets):3d} ölçüm] "
-                      f"ortalama: {cur_mean:+7.1f}ms  "
-                      f"hassasiyet: ±{cur_se:.0f}ms  "
-                      f"(son: {obs_off:+.0f}ms, RTT: {rtt:.0f}ms)")
-        else:
-            if i % 100 == 0:
-                print(f"   [{i+1:3d}/{target_samples}] ⚠️ Geçiş yakalanamadı")
+    summary = OffsetSummary()
+    rtt_stats = RunningStats()
 
-        # Kısa bekleme (sonraki geçişi yakalamak için)
-        time.sleep(0.1)
+    sampler = _Sampler(ntp_off)
+    pool = ThreadPoolExecutor(max_workers=CALIBRATION_WORKERS, thread_name_prefix="sampler")
+    try:
+        futures = [pool.submit(sampler.sample) for _ in range(target_samples)]
+        for i, fut in enumerate(as_completed(futures)):
+            try:
+                obs_off, rtt = fut.result()
+            except Exception:
+                obs_off, rtt = None, None
+            _report_sample(i, target_samples, obs_off, rtt, summary, rtt_stats)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        sampler.close()
+
+    summary.finish()
+    _report(summary, rtt_stats, ntp_off)
+
+
+def _report_sample(i, target_samples, obs_off, rtt, summary, rtt_stats):
+    """Tamamlanan örneği biriktir ve ilerleme satırını yazdır (yalnızca ana thread)."""
+    if obs_off is not None:
+        summary.add(obs_off)
+        rtt_stats.add(rtt)
+        stats = summary.raw
+        if stats.n % 50 == 0 or stats.n <= 5:
+            print(f"   [{stats.n:3d} ölçüm] "
+                  f"ortalama: {stats.mean:+7.1f}ms  "
+                  f"hassasiyet: ±{stats.ci95:.0f}ms  "
+                  f"(son: {obs_off:+.0f}ms, RTT: {rtt:.0f}ms)")
+    else:
+        if i % 100 == 0:
+            print(f"   [{i+1:3d}/{target_samples}] ⚠️ Geçiş yakalanamadı")
 
-    session.close()
 
+def _report(summary, rtt_stats, ntp_off):
     # 4. İstatistiksel analiz
-    if len(offsets) < 5:
-        print(f"\n❌ Yetersiz ölçüm ({len(offsets)}). En az 5 gerekli.")
+    stats = summary.raw
+    if stats.n < 5:
+        print(f"\n❌ Yetersiz ölçüm ({stats.n}). En az 5 gerekli.")
         return
 
-    print()
-    print("=" * 60)
-    print("   📊 SONUÇLAR")
-    print("=" * 60)
+    # Tüm istatistikler örnekleme sırasında biriktirildi — burada tarama yok
+    mean_offset = stats.mean
+    median_offset = summary.median
+    stdev = stats.stdev
+    confidence_95 = stats.ci95
+
+    mean_rtt = rtt_stats.mean
 
-    mean_offset = statistics.mean(offsets)
-    median_offset = statistics.median(offsets)
-    stdev = statistics.stdev(offsets)
-    stderr = stdev / (len(offsets) ** 0.5)
-    confidence_95 = 1.96 * stderr
-
-    mean_rtt = statistics.mean(rtts)
-
-    # Outlier tespiti (±2σ dışındakileri filtrele)
-    filtered = [o for o in offsets if abs(o - mean_offset) < 2 * stdev]
-    if len(filtered) >= 5:
-        clean_mean = statistics.mean(filtered)
-        clean_stdev = statistics.stdev(filtered)
-        clean_stderr = clean_stdev / (len(filtered) ** 0.5)
-        clean_95 = 1.96 * clean_stderr
+    # Outlier filtresi (medyan ± 2σ_robust) akış sırasında uygulandı
+    clean = summary.clean
+    if clean.n >= 5:
+        clean_mean = clean.mean
+        clean_95 = clean.ci95
     else:
         clean_mean = mean_offset
         clean_95 = confidence_95
 
     direction = "İLERİDE" if clean_mean > 0 else "GERİDE"
 
-    print(f"""
-   Toplam ölçüm:         {len(offsets)}
-   Outlier sonrası:       {len(filtered)}
+    # Rapor tek parça yazılır: satır başına print (kilit + flush) yok, pipe kapanırsa sessizce biter
+    lines = ["", "=" * 60, "   📊 SONUÇLAR", "=" * 60]
+    lines.append(f"""
+   Toplam ölçüm:         {stats.n}
+   Outlier sonrası:       {clean.n}
    
    Ham ortalama:          {mean_offset:+.1f}ms
    Ham medyan:            {median_offset:+.1f}ms
@@ -252,20 +694,24 @@ def main():
    ─── KARAR ───""")
 
     if clean_95 <= 15:
-        print(f"   ✅ HEDEF TUTTURULDU! Hassasiyet ±{clean_95:.0f}ms ≤ ±15ms")
-        print(f"   → Hardcoded değer: OBS_CLOCK_OFFSET = {clean_mean:+.1f}  # ms")
+        lines.append(f"   ✅ HEDEF TUTTURULDU! Hassasiyet ±{clean_95:.0f}ms ≤ ±15ms")
+        lines.append(f"   → Hardcoded değer: OBS_CLOCK_OFFSET = {clean_mean:+.1f}  # ms")
     elif clean_95 <= 30:
-        print(f"   ⚠️ İYİ ama hedefin üstünde: ±{clean_95:.0f}ms")
-        print(f"   → Daha fazla ölçüm yaparak iyileştirilebilir")
-        print(f"   → Hardcoded değer (dikkatli kullan): OBS_CLOCK_OFFSET = {clean_mean:+.1f}  # ms")
+        lines.append(f"   ⚠️ İYİ ama hedefin üstünde: ±{clean_95:.0f}ms")
+        lines.append("   → Daha fazla ölçüm yaparak iyileştirilebilir")
+        lines.append(f"   → Hardcoded değer (dikkatli kullan): OBS_CLOCK_OFFSET = {clean_mean:+.1f}  # ms")
     else:
-        print(f"   ❌ Hassasiyet yetersiz: ±{clean_95:.0f}ms")
-        print(f"   → OBS sunucusu stabil değil veya ağ çok değişken")
+        lines.append(f"   ❌ Hassasiyet yetersiz: ±{clean_95:.0f}ms")
+        lines.append("   → OBS sunucusu stabil değil veya ağ çok değişken")
 
-    print()
-    print(f"   Kullanım: engine.py tetik formülüne {clean_mean:+.1f}ms ekle")
-    print(f"   → İstek OBS açılışından {abs(clean_mean) + clean_95:.0f}ms sonra ulaşır (en kötü)")
-    print(f"   → İstek OBS açılışından {max(0, abs(clean_mean) - clean_95):.0f}ms sonra ulaşır (en iyi)")
+    lines.append("")
+    lines.append(f"   Kullanım: engine.py tetik formülüne {clean_mean:+.1f}ms ekle")
+    lines.append(f"   → İstek OBS açılışından {abs(clean_mean) + clean_95:.0f}ms sonra ulaşır (en kötü)")
+    lines.append(f"   → İstek OBS açılışından {max(0, abs(clean_mean) - clean_95):.0f}ms sonra ulaşır (en iyi)")
+
+    with contextlib.suppress(BrokenPipeError):
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 
 if __name__ == "__main__":